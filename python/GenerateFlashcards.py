@@ -1,15 +1,24 @@
-import csv
 import json
+import os
+import sys
 
-cards = []
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
 
-with open("vocab.csv", newline="", encoding="utf-8-sig") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        cards.append({
-            "front": row["Front"],
-            "back": row["Back"]
-        })
+import deckformat  # noqa: E402
+from ingest import iter_records  # noqa: E402
+
+# Pass --binary to embed the cards as a compact .deck blob instead of JSON;
+# any other argument is the deck source (CSV, spreadsheet export or JSON deck)
+EMBED_BINARY = "--binary" in sys.argv
+INPUT_FILE = next((arg for arg in sys.argv[1:] if not arg.startswith("--")), "vocab.csv")
+
+# Cards are streamed from the source straight into the page, never held as a list
+cards = ({"front": card["front"], "back": card["back"]} for card in iter_records(INPUT_FILE))
+
+if EMBED_BINARY:
+    cards_js = deckformat.js_decoder() + f'\nlet cards = decodeDeck("{deckformat.deck_base64(cards)}").all();'
+else:
+    cards_js = f"let cards = [{', '.join(json.dumps(card) for card in cards)}];"
 
 html = f"""
 <!DOCTYPE html>
@@ -67,7 +76,7 @@ html = f"""
 <div id="card"></div>
 
 <script>
-let cards = {json.dumps(cards)};
+{cards_js}
 let index = 0;
 let flipped = false;
 
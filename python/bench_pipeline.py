@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the deck pipeline on synthetic decks.
+
+For every size a raw deck is generated (data/synthdeck.py, same seed,
+same cards) and each stage is timed, best of --repeat:
+
+    clean    datacreation.clean_flashcards on the raw cards
+    minify   compact.compact_file, what oneline.py/makedataoneline.py run
+    stats    stats.deck_stats, what count.py prints from
+    html     written_standalone.generate_html with the JSON embed
+
+Results are written as JSON keyed by size and stage, tagged with the git
+commit, so two runs can be compared: --compare OLD.json prints the change
+per stage and exits with status 1 when a stage got slower by more than
+--threshold.
+
+Usage: python bench_pipeline.py [--sizes 10k,100k,1m] [--repeat 3] [--seed 0]
+           [--out bench-COMMIT.json] [--compare OLD.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR / "data"))
+
+import compact  # noqa: E402
+import datacreation  # noqa: E402
+from stats import deck_stats  # noqa: E402
+from synthdeck import generate, parse_size, size_label  # noqa: E402
+from written_standalone import generate_html  # noqa: E402
+
+DEFAULT_SIZES = "10k,100k,1m"
+DEFAULT_THRESHOLD = 0.25
+STAGES = ("clean", "minify", "stats", "html")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_size(size, repeat, seed, work_dir):
+    """{stage: {"seconds", "cards_per_second"}} for one deck size."""
+    raw = generate(size, seed)
+    seconds = {}
+
+    seconds["clean"], cards = best_of(lambda: datacreation.clean_flashcards(raw), repeat)
+    del raw
+
+    clean_path = Path(work_dir) / f"clean-{size}.json"
+    with open(clean_path, "w", encoding="utf-8") as f:
+        json.dump(cards, f, ensure_ascii=False)
+    min_path = str(Path(work_dir) / f"min-{size}.json")
+
+    seconds["minify"], _ = best_of(lambda: compact.compact_file(str(clean_path), min_path, use_brotli=False), repeat)
+    seconds["stats"], _ = best_of(lambda: deck_stats(str(clean_path)), repeat)
+    seconds["html"], _ = best_of(lambda: generate_html(cards), repeat)
+
+    return {
+        stage: {"seconds": round(seconds[stage], 4), "cards_per_second": int(size / seconds[stage])}
+        for stage in STAGES
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print per-stage changes against a baseline run; returns the regressions."""
+    regressions = []
+    print(f"📊 against {baseline.get('commit') or 'baseline'}:")
+    for label, stages in results["results"].items():
+        old_stages = baseline["results"].get(label)
+        if not old_stages:
+            continue
+        for stage, timing in stages.items():
+            old = old_stages.get(stage)
+            if not old:
+                continue
+            change = timing["seconds"] / old["seconds"] - 1
+            slower = change > threshold
+            print(f"   {label:>5} {stage:<7} {old['seconds']:9.3f}s -> {timing['seconds']:9.3f}s  "
+                  f"{change:+7.1%}{'  ⚠️ slower' if slower else ''}")
+            if slower:
+                regressions.append((label, stage, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the deck pipeline on synthetic decks.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated card counts, e.g. 10k,100k")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N per stage")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic deck seed")
+    parser.add_argument("--out", help="results file (default bench-COMMIT.json)")
+    parser.add_argument("--compare", metavar="OLD", help="results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown (0.25 = 25%%) that counts as a regression")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": {},
+    }
+
+    print(f"⏱️  Benchmarking {', '.join(size_label(size) for size in sizes)} cards, best of {args.repeat}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            label = size_label(size)
+            stages = bench_size(size, args.repeat, args.seed, work_dir)
+            results["results"][label] = stages
+            print(f"   {label:>5}: " + ", ".join(
+                f"{stage} {timing['seconds']:.3f}s ({timing['cards_per_second']:,}/s)"
+                for stage, timing in stages.items()))
+
+    out = args.out or f"bench-{commit or 'local'}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} stage(s) slower than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
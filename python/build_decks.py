@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Batch build: one standalone dungeon page per deck, in parallel.
+
+Every deck is cleaned with the datacreation.py rules (decks that are
+already in the cleaned schema pass through untouched), rendered with the
+page builder and written out.  Decks are spread over a process pool and a
+per-deck timing and size report is written at the end.
+
+Decks come from a directory (every *.json in it) or a manifest:
+
+    {
+        "out_dir": "build",
+        "variant": "dungeon",
+        "embed": "json",
+        "index": true,
+        "decks": ["class-7a.json", {"deck": "class-7b.json", "embed": "shards"}]
+    }
+
+Usage: python build_decks.py DIR_OR_MANIFEST [--out-dir build] [--jobs N]
+           [--embed json|binary|shards|gzip] [--variant dungeon] [--index] [--report build-report.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR / "data"))
+
+import datacreation  # noqa: E402
+from pagebuilder import DEFAULT_VARIANT, EMBED_MODES, PageBuilder, variant_label  # noqa: E402
+
+DEFAULT_OUT_DIR = "build"
+DEFAULT_REPORT = "build-report.json"
+REPORT_FIELDS = ("deck", "output", "status", "cards", "size", "load_ms", "clean_ms", "render_ms", "write_ms", "total_ms")
+
+# One builder per worker process, so shells are rendered once per worker
+_builder = None
+
+
+def worker_builder():
+    global _builder
+    if _builder is None:
+        _builder = PageBuilder()
+    return _builder
+
+
+def needs_cleaning(cards):
+    return any("id" not in card or "type" not in card for card in cards)
+
+
+def load_jobs(source, out_dir=DEFAULT_OUT_DIR, variant=DEFAULT_VARIANT, embed="json", index=False):
+    """Expand a deck directory or manifest into a list of job dicts."""
+    source = Path(source)
+    defaults = {"variant": variant, "embed": embed, "index": index}
+
+    if source.is_dir():
+        entries = [{"deck": str(path)} for path in sorted(source.glob("*.json"))]
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        out_dir = manifest.get("out_dir", out_dir)
+        defaults["variant"] = manifest.get("variant", variant)
+        defaults["embed"] = manifest.get("embed", embed)
+        defaults["index"] = manifest.get("index", index)
+        entries = []
+        for entry in manifest["decks"]:
+            entry = {"deck": entry} if isinstance(entry, str) else dict(entry)
+            entry["deck"] = str(source.parent / entry["deck"])
+            entries.append(entry)
+
+    jobs = []
+    for entry in entries:
+        job = {**defaults, **entry}
+        if job["embed"] not in EMBED_MODES:
+            raise ValueError(f"{job['deck']}: embed must be one of {EMBED_MODES}")
+        job.setdefault(
+            "output", str(Path(out_dir) / f"{Path(job['deck']).stem}-{variant_label(job['variant'])}.html")
+        )
+        jobs.append(job)
+    return jobs
+
+
+def job_embed(builder, job):
+    """Hand-made pages only take the JSON embed."""
+    return job["embed"] if builder.shell(job["variant"]).lazy else "json"
+
+
+def duplicate_outputs(jobs):
+    """Output paths more than one job would write."""
+    seen, duplicates = set(), []
+    for job in jobs:
+        output = str(Path(job["output"]).resolve())
+        if output in seen and job["output"] not in duplicates:
+            duplicates.append(job["output"])
+        seen.add(output)
+    return duplicates
+
+
+def build_job(job):
+    """Clean, render and write one deck (runs inside a worker process)."""
+    builder = worker_builder()
+    timings = {}
+
+    start = time.perf_counter()
+    with open(job["deck"], "rb") as f:
+        deck_bytes = f.read()
+    cards = json.loads(deck_bytes.decode("utf-8-sig"))
+    timings["load_ms"] = time.perf_counter() - start
+
+    mark = time.perf_counter()
+    if needs_cleaning(cards):
+        cards = datacreation.clean_flashcards(cards)
+    timings["clean_ms"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    embed = job_embed(builder, job)
+    html = builder.render(cards, job["variant"], embed, job["index"])
+    timings["render_ms"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    size = builder.write(html, job["output"])
+    timings["write_ms"] = time.perf_counter() - mark
+    timings["total_ms"] = time.perf_counter() - start
+
+    return {
+        "deck": job["deck"],
+        "output": job["output"],
+        "status": "built",
+        "cards": len(cards),
+        "size": size,
+        **{name: round(seconds * 1000, 2) for name, seconds in timings.items()},
+    }
+
+
+def build_all(jobs, workers=None, force=False):
+    """
+    Build every job; returns (results, wall seconds). Up-to-date outputs are
+    skipped; jobs that share an output raise ValueError before anything is built.
+    """
+    duplicates = duplicate_outputs(jobs)
+    if duplicates:
+        raise ValueError(f"more than one deck writes {', '.join(duplicates)}")
+    builder = PageBuilder()
+    results = []
+    pending = {}
+    start = time.perf_counter()
+
+    for job in jobs:
+        key = builder.build_key(Path(job["deck"]).read_bytes(), job["variant"], job_embed(builder, job), job["index"])
+        if not force and builder.is_up_to_date(job["output"], key):
+            results.append({
+                "deck": job["deck"], "output": job["output"], "status": "skipped",
+                "cards": None, "size": Path(job["output"]).stat().st_size,
+            })
+        else:
+            pending[job["output"]] = (job, key)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(build_job, job): output for output, (job, _) in pending.items()}
+            for future in as_completed(futures):
+                output = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:  # report the deck, keep building the rest
+                    job = pending[output][0]
+                    result = {"deck": job["deck"], "output": output, "status": f"failed: {error}"}
+                else:
+                    builder.record(output, pending[output][1], save=False)
+                results.append(result)
+        builder.save_manifest()
+
+    order = {job["output"]: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda r: order[r["output"]])
+    return results, time.perf_counter() - start
+
+
+def write_report(results, path, wall_seconds):
+    path = Path(path)
+    if path.suffix == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"wall_ms": round(wall_seconds * 1000, 2), "decks": results}, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build one dungeon page per deck in parallel.")
+    parser.add_argument("source", help="directory of deck JSON files, or a build manifest")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--variant", default=DEFAULT_VARIANT)
+    parser.add_argument("--embed", choices=EMBED_MODES, default="json")
+    parser.add_argument("--index", action="store_true", help="inline precomputed deck indexes (DECK_INDEX)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--report", default=DEFAULT_REPORT, help="report path (.json or .csv)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if outputs are up to date")
+    args = parser.parse_args()
+
+    try:
+        jobs = load_jobs(args.source, args.out_dir, args.variant, args.embed, args.index)
+    except ValueError as error:
+        parser.error(str(error))
+    duplicates = duplicate_outputs(jobs)
+    if duplicates:
+        parser.error(f"more than one deck writes {', '.join(duplicates)}; give them distinct outputs")
+    print(f"🏰 Building {len(jobs)} deck(s) with {args.jobs} worker(s)...")
+
+    results, wall_seconds = build_all(jobs, args.jobs, args.force)
+
+    for result in results:
+        if result["status"] == "built":
+            print(f"   built   {result['output']}: {result['cards']} cards, "
+                  f"{result['size'] / 1024:.1f} KB in {result['total_ms']:.0f} ms")
+        else:
+            print(f"   {result['status']:<7} {result['output']}")
+
+    write_report(results, args.report, wall_seconds)
+    failed = sum(1 for r in results if r["status"].startswith("failed"))
+    built = sum(1 for r in results if r["status"] == "built")
+    print(f"✅ {built} built, {len(results) - built - failed} up to date, {failed} failed "
+          f"in {wall_seconds:.2f}s; report written to {args.report}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
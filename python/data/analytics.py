@@ -0,0 +1,215 @@
+"""
+Offline analysis of the answer logs exported by the dungeon pages.
+
+Each export (📤 Export answers) is JSON lines, one answer per line:
+
+    {"t": unix seconds, "id": card id or "#position", "latency": ms,
+     "correct": bool, "floor": n, "chapter": "ChapterN", "answer": text}
+
+answer is the text typed or the option chosen; answermatch.py regrades it.
+
+Exports are streamed line by line, so any number of them can be merged.
+Per card: attempts, accuracy and median latency, and a difficulty level
+from the card's error rate, smoothed towards the deck average so a card
+answered twice cannot jump to the top level.  Per chapter: accuracy on
+the 1st, 2nd, ... time a player met a card (one export = one player),
+the chapter's learning curve.
+
+"#position" keys only name a card within its chapter, so they are kept
+as "ChapterN#position".  With --deck they are resolved to that deck's
+card ids; ones that stay unresolved are reported but get no difficulty
+level, since the deck has no card to give it to.  --write-deck stores
+the levels in the cards' `difficulty` field; --difficulty writes them as
+{id: level}, which datacreation.py --difficulty applies whenever the
+deck is cleaned again.
+
+Usage: python analytics.py EXPORT.jsonl [EXPORT.jsonl ...] [--deck DECK]
+           [--write-deck OUT] [--difficulty difficulty.json] [--json report.json]
+"""
+
+import argparse
+import json
+import statistics
+from collections import defaultdict
+
+from datacreation import DEFAULT_DIFFICULTY, iter_clean_deck
+from stats import chapter_sort_key
+
+LEVELS = 5             # difficulty 1 (easy) .. LEVELS
+MIN_ATTEMPTS = 5       # fewer answers than this leave a card's difficulty alone
+PRIOR_ATTEMPTS = 10    # weight of the deck-wide error rate in a card's estimate
+CURVE_LENGTH = 10      # exposures tracked per learning curve
+MAX_LATENCY = 60000    # ms; longer answers were the player stepping away
+
+
+class CardStats:
+    __slots__ = ("attempts", "correct", "latencies", "resolved")
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        self.latencies = []
+        self.resolved = True
+
+
+class ChapterStats:
+    __slots__ = ("attempts", "correct", "curve_attempts", "curve_correct")
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        self.curve_attempts = [0] * CURVE_LENGTH
+        self.curve_correct = [0] * CURVE_LENGTH
+
+
+def iter_events(paths):
+    """(export index, event) for every line of every export, in file order."""
+    for n, path in enumerate(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield n, json.loads(line)
+
+
+def resolve_ids(deck_path):
+    """{"chapter": {"#position": id}} for decks the pages key by position."""
+    positions = defaultdict(dict)
+    for card in iter_clean_deck(deck_path):
+        chapter = positions[card.get("chapter") or "Chapter1"]
+        chapter[f"#{len(chapter)}"] = card["id"]
+    return positions
+
+
+def analyse(events, positions=None):
+    """Per-card and per-chapter totals from (export index, event) pairs."""
+    cards = defaultdict(CardStats)
+    chapters = defaultdict(ChapterStats)
+    exposures = defaultdict(int)  # (export, card) -> answers so far
+
+    for player, event in events:
+        card_id = event.get("id")
+        chapter = event.get("chapter") or "Chapter1"
+        resolved = True
+        if isinstance(card_id, str) and card_id.startswith("#"):
+            resolved = (positions or {}).get(chapter, {}).get(card_id)
+            card_id = resolved or f"{chapter}{card_id}"
+        if card_id is None:
+            continue
+        correct = bool(event.get("correct"))
+
+        card = cards[card_id]
+        card.resolved = bool(resolved)
+        card.attempts += 1
+        card.correct += correct
+        latency = event.get("latency")
+        if isinstance(latency, (int, float)) and 0 <= latency <= MAX_LATENCY:
+            card.latencies.append(latency)
+
+        stats = chapters[chapter]
+        stats.attempts += 1
+        stats.correct += correct
+        seen = exposures[player, card_id]
+        exposures[player, card_id] = seen + 1
+        if seen < CURVE_LENGTH:
+            stats.curve_attempts[seen] += 1
+            stats.curve_correct[seen] += correct
+    return cards, chapters
+
+
+def difficulty_levels(cards):
+    """{card id: level} for resolved cards with MIN_ATTEMPTS answers or more."""
+    attempts = sum(card.attempts for card in cards.values())
+    if not attempts:
+        return {}
+    mean_error = 1 - sum(card.correct for card in cards.values()) / attempts
+    levels = {}
+    for card_id, card in cards.items():
+        if card.attempts < MIN_ATTEMPTS or not card.resolved:
+            continue
+        wrong = card.attempts - card.correct
+        error = (wrong + PRIOR_ATTEMPTS * mean_error) / (card.attempts + PRIOR_ATTEMPTS)
+        levels[card_id] = min(LEVELS, 1 + int(error * LEVELS))
+    return levels
+
+
+def report(cards, chapters, levels):
+    return {
+        "cards": {
+            card_id: {
+                "attempts": card.attempts,
+                "accuracy": round(card.correct / card.attempts, 3),
+                "median_latency": statistics.median(card.latencies) if card.latencies else None,
+                "difficulty": levels.get(card_id),
+            }
+            for card_id, card in sorted(cards.items())
+        },
+        "chapters": {
+            chapter: {
+                "attempts": stats.attempts,
+                "accuracy": round(stats.correct / stats.attempts, 3),
+                "curve": [round(c / a, 3) for a, c in zip(stats.curve_attempts, stats.curve_correct) if a],
+            }
+            for chapter, stats in sorted(chapters.items(), key=lambda item: chapter_sort_key(item[0]))
+        },
+    }
+
+
+def write_deck(deck_path, out_path, levels):
+    """Copy a deck with `difficulty` set from levels; returns the cards changed."""
+    changed = 0
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for n, card in enumerate(iter_clean_deck(deck_path)):
+            level = levels.get(card["id"], card.get("difficulty", DEFAULT_DIFFICULTY))
+            if level != card.get("difficulty"):
+                card["difficulty"] = level
+                changed += 1
+            out.write(("," if n else "") + json.dumps(card, ensure_ascii=False, separators=(",", ":")))
+        out.write("]")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Card difficulty and learning curves from answer logs.")
+    parser.add_argument("exports", nargs="+", help="answer logs exported from the game (JSON lines)")
+    parser.add_argument("--deck", help="cleaned deck the logs were played with")
+    parser.add_argument("--write-deck", metavar="OUT", help="write the deck with difficulty filled in (needs --deck)")
+    parser.add_argument("--difficulty", metavar="OUT", help="write {id: level} for datacreation.py --difficulty")
+    parser.add_argument("--json", help="write the full report")
+    args = parser.parse_args()
+    if args.write_deck and not args.deck:
+        parser.error("--write-deck needs --deck")
+
+    positions = resolve_ids(args.deck) if args.deck else None
+    cards, chapters = analyse(iter_events(args.exports), positions)
+    levels = difficulty_levels(cards)
+    summary = report(cards, chapters, levels)
+
+    answers = sum(stats.attempts for stats in chapters.values())
+    print(f"📊 {answers} answers to {len(cards)} cards in {len(chapters)} chapters")
+    unresolved = sum(not card.resolved for card in cards.values())
+    if unresolved:
+        print(f"   {unresolved} \"#position\" cards unresolved{'' if args.deck else ' (no --deck)'}: no difficulty level")
+    for chapter, stats in summary["chapters"].items():
+        curve = " ".join(f"{rate:.0%}" for rate in stats["curve"])
+        print(f"   {chapter}: {stats['attempts']} answers, {stats['accuracy']:.0%} right; by exposure: {curve}")
+    hardest = sorted(levels, key=lambda card_id: summary["cards"][card_id]["accuracy"])[:5]
+    if hardest:
+        print("   hardest: " + ", ".join(
+            f"{card_id} ({summary['cards'][card_id]['accuracy']:.0%})" for card_id in hardest))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"✅ Report written to {args.json}")
+    if args.difficulty:
+        with open(args.difficulty, "w", encoding="utf-8") as f:
+            json.dump(levels, f, ensure_ascii=False, indent=0, sort_keys=True)
+        print(f"✅ {len(levels)} difficulty levels written to {args.difficulty}")
+    if args.write_deck:
+        changed = write_deck(args.deck, args.write_deck, levels)
+        print(f"✅ {args.write_deck}: difficulty changed on {changed} cards")
+
+
+if __name__ == "__main__":
+    main()
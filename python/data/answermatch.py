@@ -0,0 +1,197 @@
+"""
+Typed-answer matching, shared by the pages and batch grading.
+
+A card's `back` is turned once into its accepted answer keys: the whole
+answer plus every alternative split on "," and "/" outside parentheses
+("hit (someone/something)" stays whole), each also without
+its parenthesised part and without a leading article ("a student" ->
+"student", "att läsa" -> "läsa").  Keys are lower case, without
+punctuation, with diacritics folded (å/ä -> a, ö -> o, é -> e), so
+"Ole" matches "Olé".
+
+A typed answer is normalized the same way and is right if it equals a
+key (exact) or is within a few edits of one (fuzzy): MAX_EDITS by key
+length, where swapping two neighbouring letters counts as one edit.  The
+edit distance table is abandoned as soon as a whole row exceeds the
+limit, so a clearly wrong answer costs a row or two.  Short words sit an
+edit apart from other real words ("tree"/"three", "form"/"from"), so a
+typed answer that is itself one of the deck's keys is never a typo of
+another card's: it is wrong.
+
+`pagebuilder.py --index` inlines answer_table() as DECK_INDEX.answers;
+templates/dungeon/game.js and index.html carry the same rules as JS
+(ANSWER MATCHING), so keep ARTICLES, MAX_EDITS and normalize() in sync.
+
+The CLI regrades answer logs exported by the pages (📤 Export answers,
+see analytics.py): lines with the card `id` ("#position" ids are looked
+up in the line's `chapter`) and the `answer` typed or chosen.  Lines
+from exports made before answers were logged are counted as "no answer".
+
+Usage: python answermatch.py DECK LOG.jsonl [--out graded.jsonl]
+           LOG lines are {"id": card id, "chapter": ..., "answer": text, ...}
+"""
+
+import argparse
+import json
+import re
+import unicodedata
+from collections import Counter
+
+from deckindex import DeckIndex
+
+INPUT_FILE = "all_chapters_clean.json"
+
+ARTICLES = ("a", "an", "the", "to", "en", "ett", "att")
+# (shortest key length, edits allowed), longest first
+MAX_EDITS = ((8, 2), (5, 1), (0, 0))
+
+_PUNCTUATION = re.compile(r"""[.,!?;:'"()\[\]{}]""")
+# "," or "/" not inside (...)
+_ALTERNATIVES = re.compile(r"[,/](?![^(]*\))")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+
+
+def fold(text):
+    """Lower case with diacritics removed."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize(text):
+    return " ".join(_PUNCTUATION.sub("", fold(text)).split())
+
+
+def strip_article(key):
+    first, _, rest = key.partition(" ")
+    return rest if rest and first in ARTICLES else key
+
+
+def answer_keys(back):
+    """Accepted keys for one answer, most literal first, without duplicates."""
+    keys = []
+    for text in [back, *_ALTERNATIVES.split(back)]:
+        for variant in (text, _PARENTHESES.sub("", text)):
+            key = normalize(variant)
+            for k in (key, strip_article(key)):
+                if k and k not in keys:
+                    keys.append(k)
+    return keys
+
+
+def max_edits(key):
+    return next(edits for length, edits in MAX_EDITS if len(key) >= length)
+
+
+def within(a, b, limit):
+    """
+    True if a is at most `limit` edits from b (insert, delete, substitute,
+    swap two neighbours); gives up as soon as a whole row is over the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if limit == 0:
+        return a == b
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+
+def match(answer, keys, known=frozenset()):
+    """
+    "exact", "fuzzy" or None for a typed answer against a card's keys;
+    known holds every key of the deck, which never count as typos.
+    """
+    typed = normalize(answer)
+    if not typed:
+        return None
+    candidates = (typed, strip_article(typed))
+    if any(c in keys for c in candidates):
+        return "exact"
+    if any(c in known for c in candidates):
+        return None
+    if any(within(c, key, max_edits(key)) for key in keys for c in candidates):
+        return "fuzzy"
+    return None
+
+
+def answer_table(cards, index=None):
+    """{chapter: [[key, ...] for each card position in the chapter]}."""
+    index = index or DeckIndex(cards)
+    return {
+        chapter: [answer_keys(index.cards[i].get("back") or "") for i in hits]
+        for chapter, hits in index.postings["chapter"].items()
+    }
+
+
+def find_card(index, card_id, chapter=None):
+    """A card by id, or by "#position" within chapter as the pages log it."""
+    if isinstance(card_id, str) and card_id.startswith("#"):
+        hits = index.postings["chapter"].get(chapter or "Chapter1", ())
+        position = card_id[1:]
+        if position.isdigit() and int(position) < len(hits):
+            return index.cards[hits[int(position)]]
+        return None
+    return index.get(card_id)
+
+
+def known_keys(table):
+    """Every key in an answer_table()."""
+    return {key for chapter in table.values() for keys in chapter for key in keys}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade logged typed answers against a deck.")
+    parser.add_argument("deck", nargs="?", default=INPUT_FILE)
+    parser.add_argument("log", help="JSON lines with `id` and `answer`")
+    parser.add_argument("--out", help="write the log back with `grade` added to each line")
+    args = parser.parse_args()
+
+    with open(args.deck, "r", encoding="utf-8") as f:
+        index = DeckIndex(json.load(f))
+    known = known_keys(answer_table(index.cards, index))
+
+    keys = {}
+    grades = Counter()
+    graded = []
+    with open(args.log, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            card = find_card(index, entry.get("id"), entry.get("chapter"))
+            if card is None:
+                grade = "unknown card"
+            elif entry.get("answer") is None:
+                grade = "no answer"
+            else:
+                back = card.get("back") or ""
+                if back not in keys:
+                    keys[back] = answer_keys(back)
+                grade = match(entry["answer"], keys[back], known) or "wrong"
+            grades[grade] += 1
+            graded.append({**entry, "grade": grade})
+
+    total = sum(grades.values())
+    print(f"Graded {total} answers: " + ", ".join(f"{grade} {n}" for grade, n in grades.most_common()))
+    if total:
+        right = grades["exact"] + grades["fuzzy"]
+        print(f"  accepted {right / total:.1%} ({grades['fuzzy']} only with a typo allowance)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for entry in graded:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: inflection.parse_fronts against the old per-card regex
+path that datacreation.py used before the parser module existed.
+
+Usage: python bench_inflection.py [deck.json] [--repeat N]
+"""
+
+import argparse
+import json
+import re
+import time
+
+from inflection import expand_forms, parse_fronts
+
+INPUT_FILE = "../flashcard-data.json"
+
+
+# --- previous implementation, kept verbatim as the baseline -------------
+def legacy_is_phrase(text):
+    text = text.strip()
+    if re.search(r"[.!?]$", text):
+        return True
+    if len(text.split()) > 1 and not re.search(r"\(.*?\)", text):
+        return True
+    return False
+
+
+def legacy_build_form(base, form):
+    form = form.strip()
+
+    if form in ["–", "-", ""]:
+        return None
+
+    if form.startswith("-"):
+        return base + form[1:]
+
+    return form
+
+
+def legacy_parse_parentheses(entry):
+    match = re.match(r"^(.*?)\s*\((.*?)\)$", entry)
+    if not match:
+        return None, None
+
+    base = match.group(1).strip()
+    forms_raw = [f.strip() for f in match.group(2).split(",")]
+
+    return base, forms_raw
+
+
+def legacy_forms(fronts):
+    out = []
+    for text in fronts:
+        text = text.strip()
+        if legacy_is_phrase(text):
+            out.append(None)
+            continue
+        base, forms_raw = legacy_parse_parentheses(text)
+        if base and forms_raw:
+            if len(forms_raw) == 3:
+                out.append({f"form{i}": legacy_build_form(base, f) for i, f in enumerate(forms_raw, 1)})
+            else:
+                out.append({"raw": forms_raw})
+        else:
+            out.append(None)
+    return out
+
+
+def parser_forms(fronts):
+    return [
+        expand_forms(p.base, p.forms) if p.kind == "word" and not p.tail else None
+        for p in parse_fronts(fronts)
+    ]
+
+
+def best_of(fn, fronts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(fronts)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", default=INPUT_FILE)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        fronts = [card["front"] for card in json.load(f)]
+
+    legacy_time, legacy = best_of(legacy_forms, fronts, args.repeat)
+    parser_time, parsed = best_of(parser_forms, fronts, args.repeat)
+
+    def raw_count(results):
+        return sum(1 for forms in results if forms and "raw" in forms)
+
+    print(f"{len(fronts)} fronts, best of {args.repeat}")
+    print(f"  regex per card : {legacy_time * 1000:8.2f} ms  ({raw_count(legacy)} raw fallbacks)")
+    print(f"  parse_fronts   : {parser_time * 1000:8.2f} ms  ({raw_count(parsed)} raw fallbacks)")
+    print(f"  speed-up       : {legacy_time / parser_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compaction stage for decks: minified JSON plus precompressed copies.
+
+The decks are mostly repeated keys and short Swedish/English strings, so
+they compress several-fold.  For every input this writes the one-line
+JSON (what oneline.py and makedataoneline.py used to produce), a .gz copy
+of it and, when the optional `brotli` package is installed, a .br copy,
+then prints how big each one is.
+
+Pages cannot rely on the server sending Content-Encoding (they are
+opened from disk or a school share), so `written_standalone.py --gzip`
+embeds chapter_blob() instead: the deck as one JSON line per chapter,
+gzip-compressed and base64-encoded, which templates/loaders/gzip.js
+inflates with DecompressionStream and parses a chapter at a time.
+Browsers have no brotli DecompressionStream, so that blob is always gzip.
+
+Usage: python compact.py DECK.json [DECK.json ...] [--out OUT.json] [--no-brotli]
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def minify(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def gzip_bytes(raw):
+    # mtime=0 keeps the output identical between builds, so page hashes are stable
+    return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def brotli_bytes(raw):
+    return brotli.compress(raw, quality=BROTLI_QUALITY) if brotli else None
+
+
+def chapter_lines(flashcard_data):
+    """One minified JSON array per chapter, chapters in sorted order, newline-separated."""
+    chapters = {}
+    for card in flashcard_data:
+        chapter = card.get("chapter") or "Chapter1"
+        chapters.setdefault(chapter, []).append({**card, "chapter": chapter})
+    names = sorted(chapters)
+    return names, b"\n".join(minify(chapters[name]) for name in names) + b"\n"
+
+
+def chapter_blob(flashcard_data):
+    """(chapter names, base64 gzip of chapter_lines) for embedding in a page."""
+    names, lines = chapter_lines(flashcard_data)
+    return names, base64.b64encode(gzip_bytes(lines)).decode("ascii")
+
+
+def compact_file(input_path, output_path=None, use_brotli=True):
+    """
+    Write the minified deck and its compressed copies; returns
+    {"input", "json", "gzip", "brotli"} sizes in bytes (brotli None when skipped).
+    """
+    if output_path is None:
+        stem, _ = os.path.splitext(input_path)
+        output_path = f"{stem}.min.json"
+    with open(input_path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+
+    raw = minify(data)
+    packed = gzip_bytes(raw)
+    squeezed = brotli_bytes(raw) if use_brotli else None
+    with open(output_path, "wb") as f:
+        f.write(raw)
+    with open(output_path + ".gz", "wb") as f:
+        f.write(packed)
+    if squeezed is not None:
+        with open(output_path + ".br", "wb") as f:
+            f.write(squeezed)
+
+    return {
+        "output": output_path,
+        "input": os.path.getsize(input_path),
+        "json": len(raw),
+        "gzip": len(packed),
+        "brotli": len(squeezed) if squeezed is not None else None,
+    }
+
+
+def print_report(sizes):
+    def kb(n):
+        return f"{n / 1024:8.1f} KB"
+
+    print(f"📦 {sizes['output']}")
+    print(f"   source   {kb(sizes['input'])}")
+    print(f"   minified {kb(sizes['json'])}  ({sizes['json'] / sizes['input']:.0%})")
+    print(f"   gzip     {kb(sizes['gzip'])}  ({sizes['input'] / sizes['gzip']:.1f}x smaller)")
+    if sizes["brotli"] is not None:
+        print(f"   brotli   {kb(sizes['brotli'])}  ({sizes['input'] / sizes['brotli']:.1f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify decks and write gzip/brotli copies with a size report.")
+    parser.add_argument("decks", nargs="+", help="deck JSON files")
+    parser.add_argument("--out", help="output path for a single deck (default: DECK.min.json)")
+    parser.add_argument("--no-brotli", action="store_true", help="skip the .br copy")
+    args = parser.parse_args()
+    if args.out and len(args.decks) > 1:
+        parser.error("--out needs a single deck")
+
+    for deck in args.decks:
+        print_report(compact_file(deck, args.out, not args.no_brotli))
+    if brotli is None and not args.no_brotli:
+        print("   (pip install brotli for .br copies)")
+
+
+if __name__ == "__main__":
+    main()
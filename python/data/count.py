@@ -1,36 +1,16 @@
-import json
-from collections import defaultdict
+# Per-chapter counts; stats.py has the full statistics and output formats
+from stats import deck_stats
 
-# Load JSON data from file
-with open("anya_single_line.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+INPUT_FILE = "anya_single_line.json"
 
-# Dictionary to store counts per chapter
-chapter_counts = defaultdict(int)
-
-# Count entries per chapter
-for entry in data:
-
-    # If entry is a list (nested structure)
-    if isinstance(entry, list):
-        for item in entry:
-            if isinstance(item, dict):
-                chapter = item.get("chapter", "").strip()
-                if chapter:
-                    chapter_counts[chapter] += 1
-
-    # If entry is already a dictionary (flat structure)
-    elif isinstance(entry, dict):
-        chapter = entry.get("chapter", "").strip()
-        if chapter:
-            chapter_counts[chapter] += 1
+stats = deck_stats(INPUT_FILE)
+chapters = stats["chapters"]
 
 # Print results for Chapter1 to Chapter24 (even if zero)
 for i in range(1, 25):  # 1 through 24
     chapter_name = f"Chapter{i}"
-    count = chapter_counts.get(chapter_name, 0)
+    count = chapters.get(chapter_name, {}).get("cards", 0)
     print(f"{chapter_name}: {count} items")
 
 # Optional: total count
-total = sum(chapter_counts.values())
-print(f"\nTotal entries: {total}")
\ No newline at end of file
+print(f"\nTotal entries: {stats['total']['cards']}")
\ No newline at end of file
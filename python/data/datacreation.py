@@ -1,125 +1,336 @@
+import argparse
+import hashlib
 import json
+import os
 import re
 from collections import defaultdict
+from itertools import chain
+
+from inflection import expand_forms, parse_fronts
+from ingest import iter_batches, iter_records, parse_columns
+import profiling
 
 
 INPUT_FILE = "all_chapters_raw.json"
 OUTPUT_FILE = "all_chapters_clean.json"
+CACHE_DIR = ".clean-cache"
 
+# Bump whenever the cleaned output for an unchanged raw entry changes, so
+# stale per-chapter caches are thrown away.
+CLEANER_VERSION = 4
 
-def is_phrase(text):
-    text = text.strip()
-    if re.search(r"[.!?]$", text):
-        return True
-    if len(text.split()) > 1 and not re.search(r"\(.*?\)", text):
-        return True
-    return False
-
-
-def build_form(base, form):
-    form = form.strip()
-
-    if form in ["–", "-", ""]:
-        return None
+# Cards parsed per call to `inflection.parse_fronts` while streaming.
+BATCH_SIZE = 1024
 
-    if form.startswith("-"):
-        return base + form[1:]
+# Difficulty of cards without measured answers (analytics.py measures them)
+DEFAULT_DIFFICULTY = 1
 
-    return form
+# Stages main() profiles (--profile, --budget)
+STAGES = ("load", "clean", "write")
 
 
-def parse_parentheses(entry):
-    match = re.match(r"^(.*?)\s*\((.*?)\)$", entry)
-    if not match:
-        return None, None
+def chapter_prefix(chapter_name):
+    return chapter_name.lower().replace(" ", "")
 
-    base = match.group(1).strip()
-    forms_raw = [f.strip() for f in match.group(2).split(",")]
 
-    return base, forms_raw
+def make_entry_id(chapter_name, number):
+    return f"{chapter_prefix(chapter_name)}_{str(number).zfill(3)}"
 
 
-def clean_flashcards(data):
-    cleaned = []
-    chapter_counters = defaultdict(int)
+def clean_back(back):
+    back = back.strip()
+    if back and back[-1] in ".!?":
+        return back[:-1]
+    return back
 
-    for card in data:
-        front_original = card["front"].strip()
-        back_clean = re.sub(r"[.!?]$", "", card["back"].strip())
-        chapter_name = card.get("chapter", "Unknown")
 
-        chapter_counters[chapter_name] += 1
-        chapter_prefix = chapter_name.lower().replace(" ", "")
-        entry_id = f"{chapter_prefix}_{str(chapter_counters[chapter_name]).zfill(3)}"
+def clean_card(card, entry_id, parsed, difficulty=None):
+    # Runs once per card: each branch returns a single dict literal
+    chapter = card.get("chapter", "Unknown")
+    level = difficulty.get(entry_id, DEFAULT_DIFFICULTY) if difficulty else DEFAULT_DIFFICULTY
+    back_clean = clean_back(card["back"])
 
-        new_entry = {
+    # Phrase
+    if parsed.kind == "phrase":
+        return {
             "id": entry_id,
-            "chapter": chapter_name,
-            "difficulty": 1,
-            "tags": []
+            "chapter": chapter,
+            "difficulty": level,
+            "tags": [],
+            "type": "phrase",
+            "front": parsed.base,
+            "back": back_clean
         }
 
-        # Phrase
-        if is_phrase(front_original):
-            new_entry.update({
-                "type": "phrase",
-                "front": front_original,
-                "back": back_clean
-            })
-            cleaned.append(new_entry)
-            continue
-
-        # Word with forms
-        base, forms_raw = parse_parentheses(front_original)
-
-        if base and forms_raw:
-            new_entry.update({
-                "type": "word",
-                "partOfSpeech": "unknown",
-                "front": base,
-                "back": back_clean
-            })
-
-            if len(forms_raw) == 3:
-                new_entry["forms"] = {
-                    "form1": build_form(base, forms_raw[0]),
-                    "form2": build_form(base, forms_raw[1]),
-                    "form3": build_form(base, forms_raw[2])
-                }
-            else:
-                new_entry["forms"] = {
-                    "raw": forms_raw
-                }
-
-            cleaned.append(new_entry)
-            continue
-
-        # Simple word
-        new_entry.update({
+    # Word with forms (a lone note such as "(= Tjena!)" is kept as raw)
+    if (parsed.forms or parsed.notes) and not parsed.tail:
+        return {
+            "id": entry_id,
+            "chapter": chapter,
+            "difficulty": level,
+            "tags": [],
             "type": "word",
             "partOfSpeech": "unknown",
-            "front": front_original,
+            "front": parsed.base,
             "back": back_clean,
-            "forms": None
-        })
+            "forms": expand_forms(parsed.base, parsed.forms) or {"raw": list(parsed.notes)}
+        }
+
+    # Simple word (trailing particles or glosses keep the full front)
+    return {
+        "id": entry_id,
+        "chapter": chapter,
+        "difficulty": level,
+        "tags": [],
+        "type": "word",
+        "partOfSpeech": "unknown",
+        "front": parsed.base if not parsed.tail else card["front"].strip(),
+        "back": back_clean,
+        "forms": None
+    }
+
+
+def iter_clean_flashcards(cards, difficulty=None):
+    """
+    Yield cleaned entries one at a time from any iterable of raw cards;
+    difficulty ({id: level}, from analytics.py) overrides DEFAULT_DIFFICULTY.
+    """
+    chapter_counters = defaultdict(int)
+    prefixes = {}
+
+    for batch in iter_batches(cards, BATCH_SIZE):
+        parsed_fronts = parse_fronts([card["front"] for card in batch])
+
+        for card, parsed in zip(batch, parsed_fronts):
+            chapter_name = card.get("chapter", "Unknown")
+            chapter_counters[chapter_name] += 1
+            prefix = prefixes.get(chapter_name)
+            if prefix is None:
+                prefix = prefixes[chapter_name] = chapter_prefix(chapter_name)
+            entry_id = f"{prefix}_{chapter_counters[chapter_name]:03d}"
+            yield clean_card(card, entry_id, parsed, difficulty)
+
+
+def clean_flashcards(data, difficulty=None):
+    return list(iter_clean_flashcards(data, difficulty))
+
+
+def iter_deck(input_file, **options):
+    """
+    Stream the cards of any deck source (ingest.py: JSON decks with nested
+    per-chapter lists flattened, CSV, spreadsheets); options go to
+    ingest.iter_records.
+    """
+    return iter_records(input_file, **options)
+
+
+def iter_clean_deck(input_file, **options):
+    """Stream any deck file as cleaned entries; already cleaned decks pass through."""
+    cards = iter_deck(input_file, **options)
+    first = next(cards, None)
+    if first is None:
+        return
+    cards = chain([first], cards)
+    if "id" in first and "type" in first:
+        yield from cards
+    else:
+        yield from iter_clean_flashcards(cards)
+
+
+# ============================================
+# STREAMING / INCREMENTAL BUILD
+# ============================================
+def dump_entry(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+def chapter_hashes(input_file, difficulty=None, **options):
+    """
+    Content hash of the raw entries of every chapter, in one streaming pass
+    (with a difficulty table, each entry's own level is part of its hash).
+    """
+    hashers = {}
+    chapter_counters = defaultdict(int)
+    salt = f"v{CLEANER_VERSION}".encode("utf-8")
 
-        cleaned.append(new_entry)
+    for card in iter_deck(input_file, **options):
+        chapter_name = card.get("chapter", "Unknown")
+        if chapter_name not in hashers:
+            hashers[chapter_name] = hashlib.sha1(salt)
+        hashers[chapter_name].update(dump_entry(card).encode("utf-8"))
+        if difficulty:
+            chapter_counters[chapter_name] += 1
+            level = difficulty.get(make_entry_id(chapter_name, chapter_counters[chapter_name]))
+            if level is not None:
+                hashers[chapter_name].update(b"\t" + json.dumps(level).encode("utf-8"))
+        hashers[chapter_name].update(b"\n")
 
-    return cleaned
+    return {chapter: h.hexdigest() for chapter, h in hashers.items()}
 
 
-def main():
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def _fragment_path(cache_dir, chapter_name):
+    digest = hashlib.sha1(chapter_name.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{re.sub(r'[^a-z0-9_]', '', chapter_prefix(chapter_name))}-{digest}.jsonl")
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
 
-    cleaned_data = clean_flashcards(data)
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(cleaned_data, f, ensure_ascii=False, separators=(',', ':'))
+def _load_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != CLEANER_VERSION:
+        return {}
+    return manifest
+
+
+def stream_clean(input_file, output_file, cache_dir=CACHE_DIR, force=False, difficulty=None, **options):
+    """
+    Clean `input_file` into `output_file` without loading either into memory.
+
+    Cleaned entries are also kept per chapter in `cache_dir` together with
+    the hash of that chapter's raw entries and of the fragment itself;
+    chapters whose raw entries did not change are copied from the cache
+    instead of being cleaned again, unless their fragment was damaged.
+    Only one fragment is open at a time: decks list a chapter's cards
+    together, and a chapter that comes back later is reopened where it
+    was left.  Entry order and ids are identical to `clean_flashcards`.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    hashes = chapter_hashes(input_file, difficulty, **options)
+    manifest = {} if force else _load_manifest(cache_dir)
+    cached = manifest.get("chapters", {})
+    fragments = manifest.get("fragments", {})
+    dirty = {
+        chapter for chapter, digest in hashes.items()
+        if cached.get(chapter) != digest
+        or fragments.get(chapter) is None
+        or _file_digest(_fragment_path(cache_dir, chapter)) != fragments[chapter]
+    }
+
+    fragment = None
+    fragment_chapter = None
+    offsets = {}  # chapter -> where its fragment was left
+    chapter_counters = defaultdict(int)
+    count = 0
+    tmp_output = output_file + ".tmp"
+
+    try:
+        with open(tmp_output, "w", encoding="utf-8") as out:
+            out.write("[")
+
+            for batch in iter_batches(iter_deck(input_file, **options), BATCH_SIZE):
+                dirty_fronts = [card["front"] for card in batch if card.get("chapter", "Unknown") in dirty]
+                parsed_fronts = iter(parse_fronts(dirty_fronts))
+
+                for card in batch:
+                    chapter_name = card.get("chapter", "Unknown")
+
+                    if chapter_name != fragment_chapter:
+                        if fragment:
+                            offsets[fragment_chapter] = fragment.tell()
+                            fragment.close()
+                        path = _fragment_path(cache_dir, chapter_name)
+                        if chapter_name in dirty:
+                            mode = "a" if chapter_name in offsets else "w"
+                            fragment = open(path + ".tmp", mode, encoding="utf-8", newline="")
+                        else:
+                            fragment = open(path, "r", encoding="utf-8", newline="")
+                            fragment.seek(offsets.get(chapter_name, 0))
+                        fragment_chapter = chapter_name
+
+                    if chapter_name in dirty:
+                        chapter_counters[chapter_name] += 1
+                        entry_id = make_entry_id(chapter_name, chapter_counters[chapter_name])
+                        line = dump_entry(clean_card(card, entry_id, next(parsed_fronts), difficulty))
+                        fragment.write(line + "\n")
+                    else:
+                        line = fragment.readline().rstrip("\n")
+
+                    if count:
+                        out.write(",")
+                    out.write(line)
+                    count += 1
+
+            out.write("]")
+    finally:
+        if fragment:
+            fragment.close()
+
+    for chapter_name in dirty:
+        path = _fragment_path(cache_dir, chapter_name)
+        os.replace(path + ".tmp", path)
+        fragments[chapter_name] = _file_digest(path)
+    os.replace(tmp_output, output_file)
+
+    with open(os.path.join(cache_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": CLEANER_VERSION, "chapters": hashes,
+                   "fragments": {chapter: fragments[chapter] for chapter in hashes}},
+                  f, ensure_ascii=False, indent=2)
+
+    return count, sorted(dirty)
 
-    print(f"Processed {len(cleaned_data)} entries.")
-    print(f"Clean file written to {OUTPUT_FILE}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean raw flashcards into the deck schema.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help="JSON deck, CSV or spreadsheet (see ingest.py)")
+    parser.add_argument("output", nargs="?", default=OUTPUT_FILE)
+    parser.add_argument("--stream", action="store_true",
+                        help="stream entries and only re-clean chapters whose raw entries changed")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="ignore the chapter cache (with --stream)")
+    parser.add_argument("--difficulty", help="{id: level} JSON written by analytics.py")
+    parser.add_argument("--columns", help="table columns as field=header pairs, e.g. front=back,back=front")
+    parser.add_argument("--chapter", help="chapter for cards without one (CSV and spreadsheets)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    options = {"columns": parse_columns(args.columns), "chapter": args.chapter}
+    profiler = profiling.from_arguments(args, parser, STAGES)
+
+    difficulty = None
+    if args.difficulty:
+        with open(args.difficulty, "r", encoding="utf-8") as f:
+            difficulty = json.load(f)
+
+    if args.stream:
+        with profiler.stage("clean"):
+            count, dirty = stream_clean(args.input, args.output, args.cache_dir, force=args.force,
+                                        difficulty=difficulty, **options)
+        print(f"Processed {count} entries ({len(dirty)} chapter(s) re-cleaned).")
+        print(f"Clean file written to {args.output}")
+        profiling.finish(profiler, args)
+        return
+
+    if profiler.enabled:
+        # Run the stages one after the other so each is measured on its own
+        with profiler.stage("load"):
+            entries = list(iter_deck(args.input, **options))
+        with profiler.stage("clean"):
+            entries = list(iter_clean_flashcards(entries, difficulty))
+    else:
+        entries = iter_clean_flashcards(iter_deck(args.input, **options), difficulty)
+
+    count = 0
+    with profiler.stage("write"), open(args.output, "w", encoding="utf-8") as f:
+        f.write("[")
+        for entry in entries:
+            f.write(("," if count else "") + dump_entry(entry))
+            count += 1
+        f.write("]")
+
+    print(f"Processed {count} entries.")
+    print(f"Clean file written to {args.output}")
+    profiling.finish(profiler, args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,133 @@
+// Browser-side reader for the .deck format written by deckformat.py.
+// decodeDeck(base64) returns { chapters, cards(chapter), all() }; columns
+// are typed-array views into one ArrayBuffer and cards are only turned
+// into objects when a chapter is asked for.
+function decodeDeck(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return openDeck(bytes.buffer);
+}
+
+function openDeck(buffer) {
+    const FIELDS = ['id', 'chapter', 'difficulty', 'tags', 'type', 'partOfSpeech', 'front', 'back', 'forms'];
+    const STRING_COLUMNS = ['id', 'type', 'partOfSpeech', 'front', 'back', 'form1', 'form2', 'form3', 'tags', 'extra'];
+    const FORM_KEYS = ['form1', 'form2', 'form3'];
+    const FORMS_RAW = 0x80;
+    const FORMS_DICT = 0x40;
+    const SEP = '\x1f';
+
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'SVDK' || view.getUint16(4, true) !== 1) {
+        throw new Error('Unsupported deck data');
+    }
+    const wide = view.getUint16(6, true) & 1;
+    const nCards = view.getUint32(8, true);
+    const nStrings = view.getUint32(12, true);
+    const nChapters = view.getUint32(16, true);
+    const blobSize = view.getUint32(20, true);
+    const columnMask = view.getUint32(24, true);
+    const NONE = wide ? 0xFFFFFFFF : 0xFFFF;
+    const RefArray = wide ? Uint32Array : Uint16Array;
+
+    let pos = 28;
+    const offsets = new Uint32Array(buffer, pos, nStrings + 1);
+    pos += (nStrings + 1) * 4;
+    const blob = new Uint8Array(buffer, pos, blobSize);
+    pos += blobSize + ((4 - blobSize % 4) % 4);
+    const chapterTable = new Uint32Array(buffer, pos, nChapters * 3);
+    pos += nChapters * 12;
+    // Columns left out of the file read as all-missing.
+    const missing = { length: nCards };
+    const columns = {};
+    STRING_COLUMNS.forEach((name, bit) => {
+        if (!(columnMask & (1 << bit))) {
+            columns[name] = missing;
+            return;
+        }
+        columns[name] = new RefArray(buffer, pos, nCards);
+        pos += nCards * RefArray.BYTES_PER_ELEMENT;
+        pos += (4 - pos % 4) % 4;
+    });
+    const present = new Uint16Array(buffer, pos, nCards);
+    pos += nCards * 2;
+    const difficulty = new Uint16Array(buffer, pos, nCards);
+    pos += nCards * 2;
+    pos += (4 - pos % 4) % 4;
+    const formsKind = new Uint8Array(buffer, pos, nCards);
+
+    const decoder = new TextDecoder();
+    const stringCache = new Map();
+    function string(idx) {
+        if (idx === NONE || idx === undefined) return null;
+        let value = stringCache.get(idx);
+        if (value === undefined) {
+            value = decoder.decode(blob.subarray(offsets[idx], offsets[idx + 1]));
+            stringCache.set(idx, value);
+        }
+        return value;
+    }
+
+    const chapterRanges = {};
+    const chapters = [];
+    for (let i = 0; i < nChapters; i++) {
+        // The chapter table is u32 even in narrow decks, so "no chapter" is always 0xFFFFFFFF
+        const nameIdx = chapterTable[3 * i];
+        const name = nameIdx === 0xFFFFFFFF ? null : string(nameIdx);
+        chapterRanges[name] = [chapterTable[3 * i + 1], chapterTable[3 * i + 2]];
+        chapters.push(name);
+    }
+
+    function card(i, chapter) {
+        const mask = present[i];
+        const out = {};
+        FIELDS.forEach((field, bit) => {
+            if (!(mask & (1 << bit))) return;
+            if (field === 'chapter') {
+                out.chapter = chapter;
+            } else if (field === 'difficulty') {
+                out.difficulty = difficulty[i];
+            } else if (field === 'tags') {
+                const tags = string(columns.tags[i]);
+                out.tags = tags ? tags.split(SEP) : [];
+            } else if (field === 'forms') {
+                const kind = formsKind[i];
+                if (kind === FORMS_RAW) {
+                    const raw = string(columns.form1[i]);
+                    out.forms = { raw: raw === null ? [] : raw.split(SEP) };
+                } else if (kind & FORMS_DICT) {
+                    out.forms = {};
+                    FORM_KEYS.forEach((key, b) => {
+                        if (kind & (1 << b)) out.forms[key] = string(columns[key][i]);
+                    });
+                } else {
+                    out.forms = null;
+                }
+            } else {
+                out[field] = string(columns[field][i]);
+            }
+        });
+        const extra = string(columns.extra[i]);
+        return extra ? Object.assign(out, JSON.parse(extra)) : out;
+    }
+
+    function cards(chapter) {
+        const range = chapterRanges[chapter];
+        if (!range) return [];
+        const out = new Array(range[1]);
+        for (let k = 0; k < range[1]; k++) {
+            out[k] = card(range[0] + k, chapter);
+        }
+        return out;
+    }
+
+    return {
+        chapters,
+        size: nCards,
+        cards,
+        all: () => chapters.flatMap(cards)
+    };
+}
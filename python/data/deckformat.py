@@ -0,0 +1,398 @@
+"""
+Compact columnar binary format for flashcard decks (".deck").
+
+The JSON decks repeat the same keys and values on every card.  A .deck
+file stores every distinct string once in a string table and keeps the
+cards as fixed-width little-endian columns, grouped by chapter:
+
+    header      magic b"SVDK", u16 version, u16 flags, u32 cards,
+                u32 strings, u32 chapters, u32 blob size, u32 column mask
+    strings     u32 offsets[strings + 1], utf-8 blob
+    chapters    u32 (name, start, count) per chapter
+    ref columns id, type, partOfSpeech, front, back, form1..3, tags, extra
+                (string indexes; u16 unless FLAG_WIDE, columns whose
+                values are all missing are left out, see column mask)
+    u16 columns present, difficulty
+    u8 columns  forms
+
+Every section starts on a 4-byte boundary so the columns can be viewed
+straight out of an mmap (and out of an ArrayBuffer in the browser, see
+deckformat.js) without copying.  Cards of one chapter are contiguous, so
+`Deck.column(name, chapter)` is a slice of the column.
+
+Usage: python deckformat.py deck.json [deck.deck]
+"""
+
+import base64
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+MAGIC = b"SVDK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIII")
+FLAG_WIDE = 0x1
+NONE = 0xFFFFFFFF
+NONE16 = 0xFFFF
+TAG_SEP = "\x1f"
+
+# Bit i of the `present` column is set when FIELDS[i] is a key of the card.
+FIELDS = ("id", "chapter", "difficulty", "tags", "type", "partOfSpeech", "front", "back", "forms")
+STRING_COLUMNS = ("id", "type", "partOfSpeech", "front", "back", "form1", "form2", "form3", "tags", "extra")
+FORM_KEYS = ("form1", "form2", "form3")
+
+# `forms` column: 0 = None, FORMS_RAW = {"raw": [...]} (joined into form1),
+# FORMS_DICT | keymask = {"form1": ..} with bit i set for FORM_KEYS[i].
+FORMS_RAW = 0x80
+FORMS_DICT = 0x40
+
+JS_DECODER_PATH = Path(__file__).with_name("deckformat.js")
+
+
+def _pad(buf):
+    buf.extend(b"\0" * (-len(buf) % 4))
+
+
+def _le(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return NONE
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+
+def encode_deck(cards):
+    """Encode a list of card dicts into the .deck byte format."""
+    chapter_order = {}
+    grouped = []
+    for card in cards:
+        chapter = card.get("chapter")
+        if chapter not in chapter_order:
+            chapter_order[chapter] = len(grouped)
+            grouped.append([])
+        grouped[chapter_order[chapter]].append(card)
+
+    strings = _StringTable()
+    columns = {name: array("I") for name in STRING_COLUMNS}
+    present = array("H")
+    difficulty = array("H")
+    forms_kind = array("B")
+    chapters = array("I")
+
+    start = 0
+    for chapter, chapter_cards in zip(chapter_order, grouped):
+        chapters.extend((strings.add(chapter), start, len(chapter_cards)))
+        start += len(chapter_cards)
+
+        for card in chapter_cards:
+            mask = 0
+            for bit, field in enumerate(FIELDS):
+                if field in card:
+                    mask |= 1 << bit
+            present.append(mask)
+
+            diff = card.get("difficulty", 0)
+            if not isinstance(diff, int) or not 0 <= diff < 0xFFFF:
+                raise ValueError(f"difficulty must be an integer 0..65534, got {diff!r}")
+            difficulty.append(diff)
+
+            for field in ("id", "type", "partOfSpeech", "front", "back"):
+                columns[field].append(strings.add(card.get(field)))
+            tags = card.get("tags")
+            columns["tags"].append(strings.add(TAG_SEP.join(tags)) if tags else NONE)
+
+            forms = card.get("forms")
+            form_values = [None, None, None]
+            if forms is None:
+                kind = 0
+            elif set(forms) == {"raw"}:
+                kind = FORMS_RAW
+                # An empty list is stored as missing, so it does not come back as [""]
+                form_values[0] = TAG_SEP.join(forms["raw"]) if forms["raw"] else None
+            elif set(forms) <= set(FORM_KEYS):
+                kind = FORMS_DICT
+                for i, key in enumerate(FORM_KEYS):
+                    if key in forms:
+                        kind |= 1 << i
+                        form_values[i] = forms[key]
+            else:
+                raise ValueError(f"unsupported forms object: {forms!r}")
+            forms_kind.append(kind)
+            for key, value in zip(FORM_KEYS, form_values):
+                columns[key].append(strings.add(value))
+
+            extra = {k: v for k, v in card.items() if k not in FIELDS}
+            columns["extra"].append(
+                strings.add(json.dumps(extra, ensure_ascii=False, separators=(",", ":"))) if extra else NONE
+            )
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for value in strings.strings:
+        blob.extend(value.encode("utf-8"))
+        offsets.append(len(blob))
+
+    wide = len(strings.strings) >= NONE16
+    column_mask = 0
+    for bit, name in enumerate(STRING_COLUMNS):
+        if any(idx != NONE for idx in columns[name]):
+            column_mask |= 1 << bit
+
+    out = bytearray(HEADER.pack(
+        MAGIC, VERSION, FLAG_WIDE if wide else 0, len(present),
+        len(strings.strings), len(grouped), len(blob), column_mask
+    ))
+    out.extend(_le(offsets))
+    out.extend(blob)
+    _pad(out)
+    out.extend(_le(chapters))
+    for bit, name in enumerate(STRING_COLUMNS):
+        if column_mask & (1 << bit):
+            column = columns[name]
+            if not wide:
+                column = array("H", [NONE16 if idx == NONE else idx for idx in column])
+            out.extend(_le(column))
+            _pad(out)
+    out.extend(_le(present))
+    out.extend(_le(difficulty))
+    _pad(out)
+    out.extend(forms_kind.tobytes())
+    _pad(out)
+    return bytes(out)
+
+
+def write_deck(cards, path):
+    data = encode_deck(cards)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def deck_base64(cards):
+    """The encoded deck as a base64 string, for embedding into HTML."""
+    return base64.b64encode(encode_deck(cards)).decode("ascii")
+
+
+def js_decoder():
+    """Source of the browser-side decoder (defines `decodeDeck`)."""
+    return JS_DECODER_PATH.read_text(encoding="utf-8")
+
+
+class _Missing:
+    """Stand-in for a column left out of the file: n entries, all missing."""
+
+    def __init__(self, n):
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter((None,) * self._n)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return _Missing(len(range(self._n)[key]))
+        range(self._n)[key]  # IndexError past the end, like a real column
+        return None
+
+
+class Deck:
+    """
+    Read-only view of a .deck file or buffer.
+
+    Opening a path maps the file; columns are memoryviews into the map, so
+    nothing is copied until a card is actually materialised.
+    """
+
+    def __init__(self, source):
+        self._file = None
+        self._map = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            buf = memoryview(source)
+        else:
+            self._file = open(source, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = memoryview(self._map)
+        self._buf = buf
+
+        magic, version, flags, n_cards, n_strings, n_chapters, blob_size, column_mask = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a .deck file")
+        if version != VERSION:
+            raise ValueError(f"unsupported .deck version {version}")
+        if sys.byteorder == "big":
+            raise NotImplementedError(".deck views need a little-endian host")
+
+        pos = HEADER.size
+
+        def take(count, fmt, size):
+            nonlocal pos
+            view = buf[pos:pos + count * size].cast(fmt)
+            pos += count * size
+            return view
+
+        self._offsets = take(n_strings + 1, "I", 4)
+        self._blob = buf[pos:pos + blob_size]
+        pos += blob_size + (-blob_size % 4)
+        chapter_table = take(n_chapters * 3, "I", 4)
+        self._none = NONE if flags & FLAG_WIDE else NONE16
+        ref = ("I", 4) if flags & FLAG_WIDE else ("H", 2)
+        self._columns = {}
+        for bit, name in enumerate(STRING_COLUMNS):
+            if column_mask & (1 << bit):
+                self._columns[name] = take(n_cards, *ref)
+                pos += -pos % 4
+            else:
+                self._columns[name] = _Missing(n_cards)
+        self._present = take(n_cards, "H", 2)
+        self._difficulty = take(n_cards, "H", 2)
+        pos += -pos % 4
+        self._forms = take(n_cards, "B", 1)
+
+        self._chapters = {}
+        self._chapter_of = []
+        for i in range(n_chapters):
+            name_idx, start, count = chapter_table[3 * i:3 * i + 3]
+            # The chapter table is u32 even in narrow decks: compare against NONE, not self._none
+            name = None if name_idx == NONE else self.string(name_idx)
+            self._chapters[name] = (start, count)
+            self._chapter_of.append((start, count, name))
+        self._n_cards = n_cards
+
+    # --- lifecycle ---------------------------------------------------
+    def close(self):
+        views = [self._buf, self._blob, self._offsets, self._present, self._difficulty, self._forms]
+        views.extend(v for v in self._columns.values() if isinstance(v, memoryview))
+        for view in views:
+            view.release()
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- access ------------------------------------------------------
+    def __len__(self):
+        return self._n_cards
+
+    @property
+    def chapters(self):
+        return list(self._chapters)
+
+    def string(self, idx):
+        if idx == self._none or idx is None:
+            return None
+        return str(self._blob[self._offsets[idx]:self._offsets[idx + 1]], "utf-8")
+
+    def has_column(self, name):
+        """False for a string column the file left out (see column_mask)."""
+        return not isinstance(self._columns.get(name), _Missing)
+
+    def column(self, name, chapter=None):
+        """Raw column view (string indexes for string columns), optionally per chapter."""
+        view = {"present": self._present, "difficulty": self._difficulty, "forms": self._forms}.get(name)
+        if view is None:
+            view = self._columns[name]
+        if chapter is None:
+            return view
+        start, count = self._chapters[chapter]
+        return view[start:start + count]
+
+    def chapter_range(self, chapter):
+        start, count = self._chapters[chapter]
+        return range(start, start + count)
+
+    def _chapter_name(self, i):
+        for start, count, name in self._chapter_of:
+            if start <= i < start + count:
+                return name
+        raise IndexError(i)
+
+    def card(self, i, chapter=None):
+        if chapter is None:
+            chapter = self._chapter_name(i)
+        mask = self._present[i]
+        cols = self._columns
+        card = {}
+        for bit, field in enumerate(FIELDS):
+            if not mask & (1 << bit):
+                continue
+            if field == "chapter":
+                card[field] = chapter
+            elif field == "difficulty":
+                card[field] = self._difficulty[i]
+            elif field == "tags":
+                tags = self.string(cols["tags"][i])
+                card[field] = tags.split(TAG_SEP) if tags else []
+            elif field == "forms":
+                kind = self._forms[i]
+                if kind == FORMS_RAW:
+                    raw = self.string(cols["form1"][i])
+                    card[field] = {"raw": raw.split(TAG_SEP) if raw is not None else []}
+                elif kind & FORMS_DICT:
+                    card[field] = {
+                        key: self.string(cols[key][i])
+                        for bit_i, key in enumerate(FORM_KEYS) if kind & (1 << bit_i)
+                    }
+                else:
+                    card[field] = None
+            else:
+                card[field] = self.string(cols[field][i])
+        extra = self.string(cols["extra"][i])
+        if extra:
+            card.update(json.loads(extra))
+        return card
+
+    def cards(self, chapter=None):
+        """Yield cards, all of them or only those of one chapter."""
+        names = [chapter] if chapter is not None else self.chapters
+        for name in names:
+            for i in self.chapter_range(name):
+                yield self.card(i, name)
+
+    def to_list(self):
+        return list(self.cards())
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else str(Path(input_file).with_suffix(".deck"))
+
+    with open(input_file, "r", encoding="utf-8") as f:
+        cards = json.load(f)
+
+    size = write_deck(cards, output_file)
+    json_size = Path(input_file).stat().st_size
+    print(f"Wrote {len(cards)} cards to {output_file}: {size / 1024:.1f} KB "
+          f"({json_size / 1024:.1f} KB as JSON)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+In-memory indexes over a cleaned deck (the datacreation.py card schema).
+
+DeckIndex builds its posting lists once, by chapter, type, partOfSpeech,
+tag and chapter+type, plus lookups from every inflected form (form1..3)
+back to its base card and from every word card's front.  Queries walk
+the shortest matching posting list only, so they cost O(result) rather
+than a scan of the whole deck.
+
+`game_index()` is the subset the dungeon game uses: per chapter, the
+positions of each type's cards within that chapter's card list.  The page
+builder can inline it as DECK_INDEX so the pools are not rebuilt in the
+browser.
+
+Usage: python deckindex.py deck.json [--chapter C] [--type T] [--pos P]
+           [--tag T] [--form WORD]
+"""
+
+import argparse
+import json
+import sys
+
+INPUT_FILE = "all_chapters_clean.json"
+DEFAULT_CHAPTER = "Chapter1"
+FORM_KEYS = ("form1", "form2", "form3")
+
+# query() keyword -> card field
+FIELDS = {"chapter": "chapter", "type": "type", "pos": "partOfSpeech"}
+
+
+def _key(word):
+    return word.strip().lower()
+
+
+class DeckIndex:
+    """Posting lists over a list of cards; results are lists of cards."""
+
+    def __init__(self, cards):
+        self.cards = list(cards)
+        self.by_id = {}
+        self.postings = {name: {} for name in (*FIELDS, "tag", "chapter_type")}
+        self.chapter_position = []  # position of each card within its chapter
+        self.forms = {}
+        self.fronts = {}  # word cards by front, for words without inflections
+
+        postings = self.postings
+        chapter_sizes = {}
+        for i, card in enumerate(self.cards):
+            chapter = card.get("chapter") or DEFAULT_CHAPTER
+            if "id" in card:
+                self.by_id[card["id"]] = i
+            for name, field in FIELDS.items():
+                value = chapter if name == "chapter" else card.get(field)
+                postings[name].setdefault(value, []).append(i)
+            for tag in card.get("tags") or ():
+                postings["tag"].setdefault(tag, []).append(i)
+            postings["chapter_type"].setdefault((chapter, card.get("type")), []).append(i)
+
+            self.chapter_position.append(chapter_sizes.get(chapter, 0))
+            chapter_sizes[chapter] = self.chapter_position[-1] + 1
+
+            forms = card.get("forms") or {}
+            for key in FORM_KEYS:
+                if forms.get(key):
+                    self.forms.setdefault(_key(forms[key]), []).append(i)
+            if card.get("type") == "word":
+                self.fronts.setdefault(_key(card.get("front") or ""), []).append(i)
+
+    def __len__(self):
+        return len(self.cards)
+
+    # --- queries -----------------------------------------------------
+    def values(self, name):
+        """Distinct values of an indexed field (chapter, type, pos, tag)."""
+        return list(self.postings[name])
+
+    def positions(self, chapter=None, type=None, pos=None, tag=None):
+        """Deck positions of cards matching every given filter, in deck order."""
+        filters = {"chapter": chapter, "type": type, "pos": pos, "tag": tag}
+        filters = {name: value for name, value in filters.items() if value is not None}
+        if not filters:
+            return list(range(len(self.cards)))
+
+        if len(filters) == 1:
+            (name, value), = filters.items()
+            return list(self.postings[name].get(value, ()))
+        if filters.keys() == {"chapter", "type"}:
+            return list(self.postings["chapter_type"].get((chapter, type), ()))
+
+        lists = [self.postings[name].get(value, ()) for name, value in filters.items()]
+        if "chapter" in filters and "type" in filters:
+            lists.append(self.postings["chapter_type"].get((chapter, type), ()))
+        shortest = min(lists, key=len)
+        return [i for i in shortest if self._matches(self.cards[i], filters)]
+
+    def _matches(self, card, filters):
+        for name, value in filters.items():
+            if name == "tag":
+                if value not in (card.get("tags") or ()):
+                    return False
+            elif name == "chapter":
+                if (card.get("chapter") or DEFAULT_CHAPTER) != value:
+                    return False
+            elif card.get(FIELDS[name]) != value:
+                return False
+        return True
+
+    def query(self, chapter=None, type=None, pos=None, tag=None):
+        """Cards matching every given filter."""
+        return [self.cards[i] for i in self.positions(chapter, type, pos, tag)]
+
+    def get(self, card_id):
+        i = self.by_id.get(card_id)
+        return None if i is None else self.cards[i]
+
+    def base_cards(self, word):
+        """Cards that have `word` as one of their inflected forms (or as front)."""
+        key = _key(word)
+        hits = self.forms.get(key)
+        if hits is None:
+            hits = self.fronts.get(key, ())
+        return [self.cards[i] for i in hits]
+
+    # --- export ------------------------------------------------------
+    def game_index(self):
+        """{"pools": {chapter: {type: [position within chapter, ...]}}} for the game."""
+        pools = {}
+        for (chapter, card_type), hits in self.postings["chapter_type"].items():
+            pools.setdefault(chapter, {})[card_type] = [self.chapter_position[i] for i in hits]
+        return {"pools": pools}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a cleaned deck through its indexes.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE)
+    parser.add_argument("--chapter")
+    parser.add_argument("--type")
+    parser.add_argument("--pos", help="partOfSpeech")
+    parser.add_argument("--tag")
+    parser.add_argument("--form", help="find the base card of an inflected form")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        index = DeckIndex(json.load(f))
+
+    if args.form:
+        cards = index.base_cards(args.form)
+    else:
+        cards = index.query(args.chapter, args.type, args.pos, args.tag)
+
+    for card in cards:
+        print(f"{card.get('id', '?'):<16} {card['front']} = {card['back']}")
+    print(f"{len(cards)} of {len(index)} cards", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Find duplicate and near-duplicate cards within and across decks.
+
+Every deck is streamed through the datacreation.py cleaning pass, then:
+
+  exact  cards whose normalized fronts (case, punctuation and whitespace
+         folded) hash to the same key
+  near   distinct fronts whose character trigram sets have a Jaccard
+         similarity of at least NEAR_THRESHOLD
+
+Near duplicates are found with one-permutation MinHash and LSH banding:
+only fronts that share a band bucket are compared, so the cost grows with
+the number of candidate pairs instead of n^2.
+
+Writes a merge report (JSON) and, with --out, a deck without the
+redundant cards: within a group only cards whose normalized back repeats
+an earlier card's are dropped.  Groups with different backs ("fråga":
+"ask" / "question") are separate senses; they are reported as conflicts
+and every card is kept.
+
+Usage: python dedup.py DECK.json [DECK.json ...] [--report dedup-report.json]
+           [--out deduped.json] [--near] [--threshold 0.8]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from collections import defaultdict
+
+from datacreation import iter_clean_deck
+
+REPORT_FILE = "dedup-report.json"
+NEAR_THRESHOLD = 0.8
+SHINGLE = 3
+BINS = 20           # one-permutation MinHash signature length
+BAND_ROWS = 4       # bins per LSH band; pairs above ~0.7 similarity usually collide
+MAX_BUCKET = 100    # larger buckets carry no signal (very common trigrams)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize(text):
+    return " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+
+
+def exact_key(text):
+    return hashlib.blake2b(normalize(text).encode("utf-8"), digest_size=8).digest()
+
+
+def shingles(text, n=SHINGLE):
+    padded = f" {text} "
+    return frozenset(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def signature(grams, bins=BINS):
+    """
+    One-permutation MinHash: the minimum shingle hash falling into each bin,
+    with empty bins borrowing from the next filled one (densification) so
+    short fronts still fill every band.  Uses the builtin str hash, so
+    signatures only compare within one run.
+    """
+    sig = [None] * bins
+    for gram in grams:
+        h = hash(gram) & 0xFFFFFFFFFFFFFFFF
+        b = h % bins
+        if sig[b] is None or h < sig[b]:
+            sig[b] = h
+    for b in range(bins):
+        step = 1
+        while sig[b] is None:
+            borrowed = sig[(b + step) % bins]
+            if borrowed is not None:
+                sig[b] = borrowed + step
+            step += 1
+    return sig
+
+
+def near_pairs(texts, threshold=NEAR_THRESHOLD):
+    """(i, j, similarity) for distinct normalized texts that are near duplicates."""
+    grams = [shingles(text) for text in texts]
+    sizes = [len(gram) for gram in grams]
+    buckets = defaultdict(list)
+    pairs = []
+    for i, gram in enumerate(grams):
+        sig = signature(gram)
+        candidates = set()
+        for band in range(0, BINS, BAND_ROWS):
+            members = buckets[(band, *sig[band:band + BAND_ROWS])]
+            if len(members) < MAX_BUCKET:
+                candidates.update(members)
+            members.append(i)
+
+        size = sizes[i]
+        # Jaccard can't exceed the ratio of the set sizes
+        low, high = threshold * size, size / threshold
+        for j in candidates:
+            other = sizes[j]
+            if other < low or other > high:
+                continue
+            shared = len(gram & grams[j])
+            similarity = shared / (size + other - shared)
+            if similarity >= threshold:
+                pairs.append((j, i, similarity))
+    return pairs
+
+
+def describe(entry):
+    deck, card = entry
+    return {"deck": deck, "id": card.get("id"), "chapter": card.get("chapter"),
+            "front": card["front"], "back": card["back"]}
+
+
+def find_duplicates(decks, near=True, threshold=NEAR_THRESHOLD):
+    """
+    Returns (entries, exact_groups, near_groups).  entries is a list of
+    (deck, card); groups are lists of entry indexes, first occurrence first.
+    Near groups link the first card of each exact key.
+    """
+    entries = []
+    by_key = {}
+    for deck in decks:
+        for card in iter_clean_deck(deck):
+            by_key.setdefault(exact_key(card["front"]), []).append(len(entries))
+            entries.append((deck, card))
+
+    exact_groups = [group for group in by_key.values() if len(group) > 1]
+    near_groups = []
+    if near:
+        # One representative per exact key, so duplicates never reach LSH
+        keys = list(by_key)
+        texts = [normalize(entries[by_key[key][0]][1]["front"]) for key in keys]
+        sets = _UnionFind()
+        linked = set()
+        for i, j, _ in near_pairs(texts, threshold):
+            sets.union(i, j)
+            linked.update((i, j))
+        clusters = defaultdict(list)
+        for i in sorted(linked):
+            clusters[sets.find(i)].append(by_key[keys[i]][0])
+        near_groups = sorted(clusters.values())
+    return entries, exact_groups, near_groups
+
+
+def redundant(entries, group):
+    """Indexes in a group whose normalized back an earlier card already has."""
+    seen = set()
+    dropped = []
+    for i in group:
+        back = normalize(entries[i][1]["back"])
+        if back in seen:
+            dropped.append(i)
+        seen.add(back)
+    return dropped
+
+
+def is_conflict(entries, group):
+    return len({normalize(entries[i][1]["back"]) for i in group}) > 1
+
+
+def build_report(decks, entries, exact_groups, near_groups, elapsed):
+    def group_report(group, kind):
+        cards = [describe(entries[i]) for i in group]
+        report = {"kind": kind, "keep": cards[0], "duplicates": cards[1:],
+                  "same_back": not is_conflict(entries, group),
+                  "dropped": [describe(entries[i]) for i in redundant(entries, group)]}
+        if kind == "near":
+            fronts = [shingles(normalize(card["front"])) for card in cards]
+            report["similarity"] = round(min(jaccard(fronts[0], f) for f in fronts[1:]), 3)
+        return report
+
+    return {
+        "decks": decks,
+        "cards": len(entries),
+        "seconds": round(elapsed, 3),
+        "summary": {
+            "exact_groups": len(exact_groups),
+            "exact_duplicates": sum(len(g) - 1 for g in exact_groups),
+            "near_groups": len(near_groups),
+            "near_duplicates": sum(len(g) - 1 for g in near_groups),
+            "conflicts": sum(is_conflict(entries, g) for g in exact_groups + near_groups),
+        },
+        "groups": [group_report(g, "exact") for g in exact_groups]
+                  + [group_report(g, "near") for g in near_groups],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate cards across decks.")
+    parser.add_argument("decks", nargs="+")
+    parser.add_argument("--report", default=REPORT_FILE)
+    parser.add_argument("--out", help="write a deck without the duplicates")
+    parser.add_argument("--near", action="store_true", help="also drop near duplicates with the same back from --out")
+    parser.add_argument("--threshold", type=float, default=NEAR_THRESHOLD)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries, exact_groups, near_groups = find_duplicates(args.decks, threshold=args.threshold)
+    elapsed = time.perf_counter() - start
+
+    report = build_report(args.decks, entries, exact_groups, near_groups, elapsed)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    summary = report["summary"]
+    print(f"{len(entries)} cards in {elapsed:.2f}s: "
+          f"{summary['exact_duplicates']} exact duplicates in {summary['exact_groups']} groups, "
+          f"{summary['near_duplicates']} near duplicates in {summary['near_groups']} groups, "
+          f"{summary['conflicts']} with different backs (kept)")
+    print(f"Report written to {args.report}")
+
+    if args.out:
+        # Only repeated senses go; groups with different backs are kept whole
+        dropped = {i for group in exact_groups for i in redundant(entries, group)}
+        if args.near:
+            dropped.update(i for group in near_groups for i in redundant(entries, group))
+        cards = [card for i, (_, card) in enumerate(entries) if i not in dropped]
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(cards, f, ensure_ascii=False, indent=2)
+        print(f"Wrote {len(cards)} cards to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
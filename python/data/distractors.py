@@ -0,0 +1,113 @@
+"""
+Precomputed multiple-choice distractors.
+
+For every card, rank the other cards of the same chapter and type by how
+plausible their `back` is as a wrong answer: similar spelling (character
+bigram overlap) and similar length.  A card whose answer keys
+(answermatch.py) share one with the card's own is never a distractor: the
+game would accept it as right ("number" for "digit, number").  Only the
+cards nearest in length are compared (WINDOW on each side of the card in
+length order), so a pool of n cards costs O(n * WINDOW) comparisons
+instead of O(n^2).
+
+The table is inlined into the game by `pagebuilder.py --index` as
+DECK_INDEX.distractors[chapter][position] = [position, ...], best first,
+so picking a question's choices is a lookup.
+
+Usage: python distractors.py deck.json [--out table.json] [--show N]
+"""
+
+import argparse
+import heapq
+import json
+import random
+import time
+
+from answermatch import answer_keys
+from deckindex import DeckIndex
+
+INPUT_FILE = "all_chapters_clean.json"
+DISTRACTORS = 6     # ranked candidates kept per card; the game picks 3
+WINDOW = 32         # neighbours compared on each side, in length order
+LENGTH_WEIGHT = 0.5
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def bigrams(text):
+    padded = f" {text} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+def rank_pool(backs, k=DISTRACTORS, window=WINDOW):
+    """
+    For a pool of answers, the indexes of the k most plausible distractors
+    of each answer (never one that shares an accepted answer key with it).
+    """
+    keys = [normalize(back) for back in backs]
+    accepted = [frozenset(answer_keys(back)) for back in backs]
+    grams = [bigrams(key) for key in keys]
+    lengths = [len(key) for key in keys]
+    by_length = sorted(range(len(backs)), key=lengths.__getitem__)
+
+    ranked = [None] * len(backs)
+    for rank, i in enumerate(by_length):
+        key, gram, length = keys[i], grams[i], lengths[i]
+        scored = []
+        for j in by_length[max(0, rank - window):rank + window + 1]:
+            if keys[j] == key or not accepted[i].isdisjoint(accepted[j]):
+                continue
+            shared = len(gram & grams[j])
+            dice = 2 * shared / (len(gram) + len(grams[j]))
+            length_gap = abs(length - lengths[j]) / max(length, lengths[j], 1)
+            scored.append((1 - dice + LENGTH_WEIGHT * length_gap, j))
+        ranked[i] = [j for _, j in heapq.nsmallest(k, scored)]
+    return ranked
+
+
+def distractor_table(cards, index=None, k=DISTRACTORS, window=WINDOW):
+    """{chapter: [[position, ...] for each card position in the chapter]}."""
+    index = index or DeckIndex(cards)
+    table = {chapter: [None] * len(hits) for chapter, hits in index.postings["chapter"].items()}
+
+    for (chapter, _), hits in index.postings["chapter_type"].items():
+        ranked = rank_pool([index.cards[i].get("back") or "" for i in hits], k, window)
+        positions = [index.chapter_position[i] for i in hits]
+        for i, choices in zip(hits, ranked):
+            table[chapter][index.chapter_position[i]] = [positions[j] for j in choices]
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank plausible distractors for every card.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE)
+    parser.add_argument("--out", help="write the table as JSON")
+    parser.add_argument("--show", type=int, default=5, help="print N random examples")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        cards = json.load(f)
+
+    start = time.perf_counter()
+    index = DeckIndex(cards)
+    table = distractor_table(cards, index)
+    elapsed = time.perf_counter() - start
+    print(f"Ranked distractors for {len(cards)} cards in {elapsed * 1000:.0f} ms")
+
+    chapters = {chapter: [index.cards[i] for i in hits] for chapter, hits in index.postings["chapter"].items()}
+    for card in random.sample(cards, min(args.show, len(cards))):
+        chapter = card.get("chapter") or "Chapter1"
+        position = chapters[chapter].index(card)
+        options = [chapters[chapter][p]["back"] for p in table[chapter][position]]
+        print(f"  {card['back']!r}: {', '.join(map(repr, options))}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
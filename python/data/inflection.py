@@ -0,0 +1,173 @@
+"""
+Parser for the Swedish inflection notation used on the card fronts.
+
+    elev (-en, -er, -erna)      -> eleven, elever, eleverna
+    lärare (-n, –, -lärarna)    -> läraren, None, lärarna
+    lång (-t, -a)               -> långt, långa
+    kaffe (-et)                 -> kaffet
+    född (-tt, -dda)            -> fött, födda
+    läsk (= läskedryck) (-en)   -> läsken, note "= läskedryck"
+    peng (vard)                 -> no forms, note "vard"
+
+The notation is parsed with a small hand-written scanner instead of
+regular expressions, and `parse_fronts` handles a whole list of fronts in
+one call so the cleaning pass can work in batches.
+"""
+
+from collections import namedtuple
+
+# kind:  "phrase" or "word"
+# base:  the headword without any parentheses
+# forms: the comma separated items of the inflection group, as written
+# notes: other parenthesised groups, e.g. "= läskedryck" or "vard"
+# tail:  text following the groups (particles, glosses), "" if none
+Front = namedtuple("Front", ["kind", "base", "forms", "notes", "tail"])
+
+EMPTY_FORMS = ("–", "-", "")
+FORM_KEYS = ("form1", "form2", "form3")
+SENTENCE_END = ".!?"
+
+# A dash form sharing this many leading letters with the headword spells
+# out a new stem ("lärare" + "-lärarna") instead of adding a suffix.
+STEM_PREFIX = 3
+VOWELS = "aeiouyåäö"
+
+
+def _doubled(text):
+    """Starts with a doubled consonant ("tt", "dda")."""
+    return len(text) >= 2 and text[0].lower() == text[1].lower() and text[0].lower() not in VOWELS
+
+
+def build_form(base, form):
+    """
+    The word one item of an inflection group stands for; None for "–".
+    A suffix that starts with the final vowel of a longer headword merges
+    with it (kaffe + -et -> kaffet, but te + -et -> teet), as does a vowel
+    suffix on an unstressed final a/e (timme + -ar -> timmar), and one that
+    starts with a doubled consonant replaces the headword's (född + -tt ->
+    fött) or follows a vowel (blå + -tt -> blått).  After any other
+    consonant, which letters go is not written down, so the item comes
+    back as written ("-tt" on "röd").
+    """
+    form = form.strip()
+
+    if form in EMPTY_FORMS:
+        return None
+
+    if form[0] == "-":
+        suffix = form[1:]
+        if (len(suffix) >= STEM_PREFIX <= len(base)
+                and suffix[:STEM_PREFIX].lower() == base[:STEM_PREFIX].lower()):
+            return suffix
+        last = base[-1:].lower()
+        if last in VOWELS:
+            first = suffix[:1].lower()
+            if first in VOWELS and (first == last or last in "ae") and any(c in VOWELS for c in base[:-1].lower()):
+                return base[:-1] + suffix
+            return base + suffix
+        if _doubled(suffix):
+            return base[:-2] + suffix if _doubled(base[-2:]) else form
+        return base + suffix
+
+    return form
+
+
+def _scan_groups(text, start):
+    """Return (groups, tail) for the parenthesised groups from `start` on."""
+    groups = []
+    pos = start
+    length = len(text)
+
+    while pos < length:
+        while pos < length and text[pos] == " ":
+            pos += 1
+        if pos >= length or text[pos] != "(":
+            break
+        close = text.find(")", pos + 1)
+        if close < 0:
+            break
+        groups.append(text[pos + 1:close])
+        pos = close + 1
+
+    return groups, text[pos:].strip()
+
+
+def _is_forms(items):
+    """
+    True if a group's items read as inflections: a dash item ("-en", "–")
+    or a list of single words ("mår, mådde, mått").  A lone word such as
+    "vard", "SEK" or "knytkalas" is a note, abbreviation or synonym.
+    """
+    for item in items:
+        if not item or item[0] in "-–":
+            return True
+    if len(items) < 2:
+        return False
+    for item in items:
+        if len(item.split()) != 1:
+            return False
+    return True
+
+
+def parse_front(text):
+    """Parse a single front; returns a `Front`."""
+    text = text.strip()
+
+    if text and text[-1] in SENTENCE_END:
+        return Front("phrase", text, (), (), "")
+
+    open_idx = text.find("(")
+    if open_idx < 0 or text.find(")", open_idx + 1) < 0:
+        if len(text.split()) > 1:
+            return Front("phrase", text, (), (), "")
+        return Front("word", text, (), (), "")
+
+    groups, tail = _scan_groups(text, open_idx)
+
+    forms = ()
+    notes = ()
+    for group in groups:
+        items = tuple([item.strip() for item in group.split(",")])
+        if not forms and group.lstrip()[:1] != "=" and _is_forms(items):
+            forms = items
+        else:
+            notes += (group.strip(),)
+
+    return Front("word", text[:open_idx].strip(), forms, notes, tail)
+
+
+def parse_fronts(fronts):
+    """Parse a list of fronts in one call; returns a list of `Front`."""
+    parse = parse_front
+    return [parse(text) for text in fronts]
+
+
+def expand_forms(base, forms):
+    """
+    Turn the raw inflection items into the cleaned `forms` object.
+
+    One to three items become `form1`..`formN`; anything else (an item
+    that is a note rather than a form, or one build_form cannot expand)
+    is kept verbatim under `raw`.
+    """
+    if not forms:
+        return None
+    if len(forms) > 3:
+        return {"raw": list(forms)}
+    items = [f.strip() for f in forms]
+    for item in items:
+        if item[:1] == "=":
+            return {"raw": list(forms)}
+    # "-er" on an -a verb drops the a (läsa: läser); whether a consonant
+    # ending does too, and how, is not written down (läste, ringde, innehöll)
+    if base[-1:] == "a" and "-er" in items:
+        for item in items:
+            if item[:1] == "-" and item[1:2] and item[1].lower() not in VOWELS:
+                return {"raw": list(forms)}
+    entry = {}
+    for key, item in zip(FORM_KEYS, items):
+        word = build_form(base, item)
+        if word is not None and word[:1] == "-":
+            return {"raw": list(forms)}
+        entry[key] = word
+    return entry
@@ -0,0 +1,279 @@
+"""
+One way in for every deck source: CSV/TSV, spreadsheet exports, .xlsx
+workbooks, JSON decks and JSON lines.
+
+A reader is picked by extension (or, failing that, by the first bytes of
+the file), the text encoding is detected (BOM, then UTF-8, then cp1252 as
+Excel writes it), and tabular rows are mapped onto card fields through
+COLUMN_ALIASES, so "Front", " back", "svenska" and "engelska" all land in
+the right place.  Records come out one at a time (iter_records) or in
+lists of BATCH_SIZE (iter_batches); nothing holds the whole file, so a
+500k-row spreadsheet streams in constant memory.
+
+JSON decks pass through untouched (nested per-chapter lists flattened),
+which is what datacreation.py and the page builders expect.
+
+Add a format with @reader("name", ".ext", ...) on a function
+(path, encoding) -> iterator of rows (dicts for JSON, lists of cells for
+tables, the first being the header).
+
+Usage: python ingest.py FILE [--format csv] [--encoding cp1252]
+           [--columns front=back,back=front] [--chapter Chapter1]
+"""
+
+import argparse
+import codecs
+import csv
+import json
+import os
+import zipfile
+from itertools import chain, islice
+from xml.etree import ElementTree
+
+from jsonstream import iter_json_array
+
+BATCH_SIZE = 1024
+SNIFF_BYTES = 1 << 16
+
+# card field -> header names (compared stripped and lower case)
+COLUMN_ALIASES = {
+    "front": ("front", "swedish", "svenska", "word", "term", "question"),
+    "back": ("back", "english", "engelska", "translation", "meaning", "answer"),
+    "chapter": ("chapter", "kapitel", "lesson"),
+}
+# Columns of a table without a recognisable header
+POSITIONAL = ("front", "back", "chapter")
+
+READERS = {}
+BINARY_FORMATS = set()  # read as bytes: no encoding to detect
+_EXTENSIONS = {}
+
+
+def reader(name, *extensions, binary=False):
+    """Register a reader for a format and the extensions it is picked for."""
+    def register(fn):
+        READERS[name] = fn
+        if binary:
+            BINARY_FORMATS.add(name)
+        for extension in extensions:
+            _EXTENSIONS[extension] = name
+        return fn
+    return register
+
+
+# ============================================
+# DETECTION
+# ============================================
+def detect_encoding(path):
+    with open(path, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # Not final: the sample may end inside a character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def detect_format(path):
+    name = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if name:
+        return name
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES).lstrip(codecs.BOM_UTF8 + b" \t\r\n")
+    if head.startswith(b"PK"):
+        return "xlsx"
+    if head.startswith(b"["):
+        return "json"
+    if head.startswith(b"{"):
+        return "jsonl"
+    return "csv"
+
+
+# ============================================
+# READERS
+# ============================================
+@reader("json", ".json")
+def read_json(path, encoding):
+    for item in iter_json_array(path):
+        if isinstance(item, list):
+            yield from (card for card in item if isinstance(card, dict))
+        elif isinstance(item, dict):
+            yield item
+
+
+@reader("jsonl", ".jsonl", ".ndjson")
+def read_jsonl(path, encoding):
+    with open(path, "r", encoding=encoding) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@reader("csv", ".csv", ".tsv", ".txt")
+def read_csv(path, encoding):
+    with open(path, "r", encoding=encoding, newline="") as f:
+        sample = f.read(SNIFF_BYTES)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel_tab if path.lower().endswith(".tsv") else csv.excel
+        yield from csv.reader(f, dialect)
+
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _column_index(ref):
+    """0-based column of a cell reference such as "AB12"."""
+    index = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + ord(ch.upper()) - 64
+    return index - 1
+
+
+@reader("xlsx", ".xlsx", binary=True)
+def read_xlsx(path, encoding):
+    """Rows of the first worksheet, parsed incrementally (stdlib only)."""
+    with zipfile.ZipFile(path) as book:
+        shared = []
+        if "xl/sharedStrings.xml" in book.namelist():
+            with book.open("xl/sharedStrings.xml") as f:
+                for _, element in ElementTree.iterparse(f):
+                    if element.tag == _SHEET_NS + "si":
+                        shared.append("".join(t.text or "" for t in element.iter(_SHEET_NS + "t")))
+                        element.clear()
+        sheets = sorted(name for name in book.namelist() if name.startswith("xl/worksheets/sheet"))
+        with book.open(sheets[0]) as f:
+            for _, element in ElementTree.iterparse(f):
+                if element.tag != _SHEET_NS + "row":
+                    continue
+                row = []
+                for cell in element.iter(_SHEET_NS + "c"):
+                    column = _column_index(cell.get("r", ""))
+                    if column < 0:
+                        column = len(row)
+                    kind = cell.get("t")
+                    if kind == "inlineStr":
+                        value = "".join(t.text or "" for t in cell.iter(_SHEET_NS + "t"))
+                    else:
+                        v = cell.find(_SHEET_NS + "v")
+                        value = "" if v is None or v.text is None else v.text
+                        if kind == "s" and value:
+                            value = shared[int(value)]
+                    row.extend([""] * (column - len(row)))
+                    row.append(value)
+                yield row
+                element.clear()
+
+
+# ============================================
+# RECORDS
+# ============================================
+def map_header(header, columns=None):
+    """
+    {card field: column index} from a header row, or None when no cell
+    names a field.  columns ({field: header name}) overrides the aliases.
+    """
+    names = [cell.strip().lower() for cell in header]
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        wanted = (columns[field].strip().lower(),) if columns and field in columns else aliases
+        for alias in wanted:
+            if alias in names:
+                mapping[field] = names.index(alias)
+                break
+    return mapping if "front" in mapping or "back" in mapping else None
+
+
+def iter_table_records(rows, columns=None):
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    mapping = map_header(first, columns)
+    if mapping is None:
+        # No header: positional columns, and the first row is a card
+        mapping = {field: i for i, field in enumerate(POSITIONAL)}
+        rows = chain([first], rows)
+    for row in rows:
+        record = {}
+        for field, i in mapping.items():
+            value = row[i].strip() if i < len(row) and row[i] else ""
+            if value:
+                record[field] = value
+        if "front" in record and "back" in record:
+            yield record
+
+
+def iter_records(path, fmt=None, encoding=None, columns=None, chapter=None):
+    """
+    Cards from any supported file, one at a time.  Tables yield
+    {"front", "back"[, "chapter"]}, rows missing a side are skipped;
+    JSON records are passed through.  chapter fills in a missing chapter.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in READERS:
+        raise ValueError(f"unknown format {fmt!r}; known: {', '.join(sorted(READERS))}")
+    if encoding is None and fmt not in BINARY_FORMATS:
+        encoding = detect_encoding(path)
+    rows = READERS[fmt](path, encoding)
+    records = rows if fmt in ("json", "jsonl") else iter_table_records(rows, columns)
+    for record in records:
+        if chapter and not record.get("chapter"):
+            record["chapter"] = chapter
+        yield record
+
+
+def iter_batches(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def parse_columns(text):
+    """"front=Svenska,back=Engelska" -> {"front": "Svenska", "back": "Engelska"}."""
+    columns = {}
+    for pair in filter(None, (part.strip() for part in (text or "").split(","))):
+        field, _, name = pair.partition("=")
+        if field not in COLUMN_ALIASES or not name:
+            raise ValueError(f"bad column mapping {pair!r}; use field=header with field in {', '.join(COLUMN_ALIASES)}")
+        columns[field] = name
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a deck source and report what would be ingested.")
+    parser.add_argument("input")
+    parser.add_argument("--format", choices=sorted(READERS), help="skip detection")
+    parser.add_argument("--encoding", help="skip detection")
+    parser.add_argument("--columns", help="field=header pairs, e.g. front=back,back=front")
+    parser.add_argument("--chapter", help="chapter for records without one")
+    parser.add_argument("--show", type=int, default=3, help="print the first N records")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.input)
+    encoding = args.encoding or (None if fmt in BINARY_FORMATS else detect_encoding(args.input))
+    records = iter_records(args.input, fmt, encoding, parse_columns(args.columns), args.chapter)
+    count = batches = 0
+    for batch in iter_batches(records):
+        if not count:
+            for record in batch[:args.show]:
+                print(f"  {json.dumps(record, ensure_ascii=False)}")
+        count += len(batch)
+        batches += 1
+    print(f"{args.input}: {fmt}{f', {encoding}' if encoding else ''}, {count} records in {batches} batch(es)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Incremental reader for the deck files.
+
+Every deck in this folder is one top-level JSON array.  `iter_json_array`
+walks that array in fixed-size chunks and yields one element at a time,
+so a deck never has to be held in memory as a whole.
+"""
+
+import json
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def _skip(buf, pos, chars):
+    while pos < len(buf) and buf[pos] in chars:
+        pos += 1
+    return pos
+
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the top-level JSON array stored in `path`."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        yield from iter_json_array_from(f, chunk_size)
+
+
+def iter_json_array_from(f, chunk_size=CHUNK_SIZE):
+    """Same as `iter_json_array`, reading from an open text stream."""
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    # Opening bracket
+    while True:
+        pos = _skip(buf, pos, _WHITESPACE)
+        if pos < len(buf) or eof:
+            break
+        fill()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("expected a JSON array at the top level")
+    pos += 1
+
+    expect_value = True
+    after_comma = False
+    while True:
+        pos = _skip(buf, pos, _WHITESPACE)
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("unexpected end of file inside JSON array")
+            fill()
+            continue
+
+        if buf[pos] == "]":
+            if expect_value and after_comma:
+                raise ValueError("trailing comma in JSON array")
+            return
+
+        if not expect_value:
+            if buf[pos] != ",":
+                raise ValueError(f"expected ',' or ']' but found {buf[pos]!r}")
+            pos += 1
+            expect_value = after_comma = True
+            continue
+
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        # A number cut off by the chunk edge still decodes (`12` of `123`,
+        # `4` of `4.5`), so read on before trusting it.
+        if not eof and (end == len(buf) or (
+                isinstance(value, (int, float)) and buf[end] in _NUMBER_CHARS)):
+            fill()
+            continue
+
+        yield value
+        pos = end
+        expect_value = False
@@ -0,0 +1,227 @@
+"""
+Per-stage profiling for the build scripts: wall time, peak RSS and the
+allocations each stage made.
+
+    profiler = Profiler(enabled=True, allocations=True)
+    with profiler.stage("load"):
+        ...
+
+A disabled profiler's stage() is a bare context manager, so entry points
+call it unconditionally.  Enabled, every stage records its wall time and
+the process's peak RSS when it ended; with allocations on, tracemalloc
+runs for the whole build and each stage also records its peak traced
+memory and the TOP_ALLOCATIONS source lines that grew most during it.
+tracemalloc slows Python down a lot, so --budget alone times stages
+without it.
+
+Entry points share the flags through add_arguments(), from_arguments()
+and finish(): --profile writes the trace as JSON, --chrome-trace also
+writes it as Chrome trace events (chrome://tracing or ui.perfetto.dev),
+and --budget "render=2,write=0.5" fails the build when a stage takes
+longer than its seconds.  A budget for a stage the entry point does not
+have, or one that is not a number, is a usage error.
+
+Usage: python profiling.py TRACE.json [--chrome-trace OUT.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_TRACE = "profile.json"
+TOP_ALLOCATIONS = 10
+# Allocations made by the profiler itself are not the build's
+_IGNORED_FRAMES = (tracemalloc.__file__, __file__, "<frozen importlib.*>")
+
+
+def peak_rss_kb():
+    """High-water resident set size of this process so far, in KB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def parse_budgets(text, stages=None):
+    """
+    "render=2,write=0.5" -> {"render": 2.0, "write": 0.5} (seconds); raises
+    ValueError for malformed pairs and, given stages, for unknown stage names.
+    """
+    budgets = {}
+    for pair in filter(None, (part.strip() for part in (text or "").split(","))):
+        stage, _, seconds = pair.partition("=")
+        stage = stage.strip()
+        try:
+            budgets[stage] = float(seconds)
+        except ValueError:
+            raise ValueError(f"bad budget {pair!r}; use stage=seconds") from None
+        if stages is not None and stage not in stages:
+            raise ValueError(f"no stage {stage!r} to budget; stages are {', '.join(stages)}")
+    return budgets
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FRAMES])
+
+
+class Profiler:
+    """Collects one record per stage; see the module docstring."""
+
+    def __init__(self, enabled=False, allocations=False):
+        self.enabled = enabled
+        self.allocations = enabled and allocations
+        self.stages = []
+        self._origin = time.perf_counter()
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        return self._measure(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _measure(self, name):
+        before = None
+        if self.allocations:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+            before = _snapshot()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            record = {
+                "name": name,
+                "start_ms": round((start - self._origin) * 1000, 3),
+                "wall_ms": round((end - start) * 1000, 3),
+                "peak_rss_kb": peak_rss_kb(),
+            }
+            if before is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                record["allocated_kb"] = round((current - traced_before) / 1024, 1)
+                record["peak_traced_kb"] = round((peak - traced_before) / 1024, 1)
+                record["top"] = [
+                    {"line": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                     "kb": round(stat.size_diff / 1024, 1), "count": stat.count_diff}
+                    for stat in _snapshot().compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+                    if stat.size_diff > 0
+                ]
+            self.stages.append(record)
+
+    def over_budget(self, budgets):
+        """[(stage, seconds taken, budget)] for every stage slower than its budget."""
+        return [(stage["name"], stage["wall_ms"] / 1000, budgets[stage["name"]])
+                for stage in self.stages
+                if stage["name"] in budgets and stage["wall_ms"] / 1000 > budgets[stage["name"]]]
+
+    def trace(self):
+        return {"pid": os.getpid(), "argv": sys.argv, "stages": self.stages}
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f, indent=2)
+
+    def write_chrome(self, path):
+        write_chrome_trace(self.trace(), path)
+
+    def print_summary(self):
+        print_stages(self.stages)
+
+
+def chrome_events(trace):
+    """Complete ("X") trace events, one per stage, in microseconds."""
+    events = []
+    for stage in trace["stages"]:
+        args = {key: value for key, value in stage.items() if key not in ("name", "start_ms", "wall_ms")}
+        events.append({
+            "name": stage["name"], "cat": "build", "ph": "X", "pid": trace.get("pid", 0), "tid": 0,
+            "ts": round(stage["start_ms"] * 1000), "dur": round(stage["wall_ms"] * 1000), "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(trace, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_events(trace), f)
+
+
+def print_stages(stages):
+    for stage in stages:
+        line = f"   ⏱️  {stage['name']:<8} {stage['wall_ms']:9.1f} ms"
+        if stage.get("peak_rss_kb") is not None:
+            line += f"   rss {stage['peak_rss_kb'] / 1024:7.1f} MB"
+        if "peak_traced_kb" in stage:
+            line += f"   traced peak {stage['peak_traced_kb'] / 1024:7.1f} MB"
+        print(line)
+        for top in stage.get("top", [])[:3]:
+            print(f"        {top['kb']:9.1f} KB  {top['line']}")
+
+
+# ============================================
+# ENTRY POINT HELPERS
+# ============================================
+def add_arguments(parser):
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_TRACE, metavar="TRACE",
+                        help=f"record time, RSS and allocations per stage into a JSON trace (default {DEFAULT_TRACE})")
+    parser.add_argument("--chrome-trace", metavar="OUT", help="also write the stages as a Chrome trace-event file")
+    parser.add_argument("--budget", metavar="STAGE=SECONDS,...", help="fail when a stage takes longer, e.g. render=2")
+
+
+def from_arguments(args, parser, stages):
+    """
+    A Profiler configured by add_arguments()' flags (disabled when none is
+    given); a bad --budget, or one naming none of stages, is a parser error.
+    """
+    try:
+        args.budget = parse_budgets(args.budget, stages)
+    except ValueError as e:
+        parser.error(f"--budget: {e}")
+    timed = bool(args.profile or args.chrome_trace or args.budget)
+    return Profiler(enabled=timed, allocations=bool(args.profile or args.chrome_trace))
+
+
+def finish(profiler, args):
+    """Write the requested traces and exit with status 1 if a stage went over budget."""
+    if not profiler.enabled:
+        return
+    profiler.print_summary()
+    if args.profile:
+        profiler.write(args.profile)
+        print(f"📈 Profile written to {args.profile}")
+    if args.chrome_trace:
+        profiler.write_chrome(args.chrome_trace)
+        print(f"📈 Chrome trace written to {args.chrome_trace}")
+    overruns = profiler.over_budget(args.budget)
+    for stage, seconds, budget in overruns:
+        print(f"❌ {stage} took {seconds:.2f}s, budget {budget:g}s")
+    if overruns:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a build profile or convert it to a Chrome trace.")
+    parser.add_argument("trace", help="JSON trace written by --profile")
+    parser.add_argument("--chrome-trace", metavar="OUT")
+    args = parser.parse_args()
+
+    with open(args.trace, "r", encoding="utf-8") as f:
+        trace = json.load(f)
+    print(f"{args.trace}: {' '.join(trace.get('argv', []))}")
+    print_stages(trace["stages"])
+    if args.chrome_trace:
+        write_chrome_trace(trace, args.chrome_trace)
+        print(f"📈 Chrome trace written to {args.chrome_trace}")
+
+
+if __name__ == "__main__":
+    main()
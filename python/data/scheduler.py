@@ -0,0 +1,209 @@
+"""
+SM-2 style spaced repetition over card ids, as the dungeon page runs it.
+
+Time is counted in answers: every review advances a chapter's clock by
+one.  Each card keeps an ease (per mille, so Python and JavaScript compute
+identical intervals), its current interval, its run of correct answers
+and the clock value at which it is due.  Seen cards wait in a heap ordered
+by (due, seq), so the next card costs O(log n) instead of a shuffle.
+
+Unseen cards wait in deck order and are only brought in when no review is
+due and fewer than maxLearning seen cards are still unlearned (not yet
+answered right since their last miss); otherwise the earliest review comes
+forward.  So a missed card comes back after lapseInterval answers instead
+of after the rest of the chapter.
+
+index.html carries a line-for-line JavaScript copy (CARD SCHEDULING);
+keep SCHEDULE and the update rules in sync.  dungeon_sim.py draws its
+cards from this class, so simulated runs follow the same schedule.
+
+Usage: python scheduler.py DECK [--chapter Chapter1] [--reviews 200]
+           [--accuracy 0.8] [--seed 0]
+"""
+
+import argparse
+import heapq
+import json
+import random
+from collections import Counter, deque
+from itertools import islice
+
+from datacreation import iter_clean_deck
+
+INPUT_FILE = "all_chapters_clean.json"
+
+SCHEDULE = {
+    "startEase": 2500,      # per mille: intervals grow x2.5
+    "minEase": 1300,
+    "easeBonus": 100,       # added to ease on a correct answer
+    "easePenalty": 200,     # taken from ease on a wrong answer
+    "firstInterval": 3,     # answers until a card comes back after its 1st correct
+    "secondInterval": 8,    # ... after its 2nd; later ones grow by ease
+    "lapseInterval": 2,     # ... after a wrong answer
+    "maxLearning": 8,       # unseen cards wait while this many cards are unlearned
+}
+
+
+def is_new(card):
+    return card.interval == 0
+
+
+class CardState:
+    __slots__ = ("ease", "interval", "reps", "due", "lapses", "seq")
+
+    def __init__(self, ease, interval=0, reps=0, due=0, lapses=0):
+        self.ease = ease
+        self.interval = interval
+        self.reps = reps
+        self.due = due
+        self.lapses = lapses
+        self.seq = 0
+
+    def to_list(self):
+        return [self.ease, self.interval, self.reps, self.due, self.lapses]
+
+
+class Scheduler:
+    """Due-ordered queue of one chapter's cards; answers reschedule them."""
+
+    def __init__(self, ids=(), saved=None, schedule=SCHEDULE):
+        saved = saved or {}
+        self.schedule = schedule
+        self.clock = saved.get("clock", 0)
+        self.cards = {}
+        self._heap = []
+        self._new = deque()
+        self._learning = set()
+        self._seq = 0
+        states = saved.get("cards", {})
+        for card_id in ids:
+            if card_id in states:
+                self.cards[card_id] = CardState(*states[card_id])
+                self._enqueue(card_id)
+            else:
+                self.add(card_id)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _push(self, card_id):
+        card = self.cards[card_id]
+        self._seq += 1
+        card.seq = self._seq
+        heapq.heappush(self._heap, (card.due, card.seq, card_id))
+
+    def _enqueue(self, card_id):
+        card = self.cards[card_id]
+        if is_new(card):
+            self._new.append(card_id)
+            return
+        if card.reps == 0:
+            self._learning.add(card_id)
+        self._push(card_id)
+
+    def _prune(self):
+        # Entries left behind by a reschedule, and new cards reviewed out
+        # of turn, are skipped lazily
+        heap = self._heap
+        while heap and self.cards[heap[0][2]].seq != heap[0][1]:
+            heapq.heappop(heap)
+        while self._new and not is_new(self.cards[self._new[0]]):
+            self._new.popleft()
+
+    def _can_introduce(self):
+        return len(self._learning) < self.schedule["maxLearning"]
+
+    def add(self, card_id):
+        """A card not seen yet, queued behind the other unseen cards."""
+        if card_id not in self.cards:
+            self.cards[card_id] = CardState(self.schedule["startEase"], due=self.clock)
+            self._new.append(card_id)
+
+    def next(self):
+        """The id of the card to show next (None if empty); it stays queued."""
+        self._prune()
+        heap = self._heap
+        if heap and heap[0][0] <= self.clock:
+            return heap[0][2]
+        if self._new and (self._can_introduce() or not heap):
+            return self._new[0]
+        return heap[0][2] if heap else None
+
+    def upcoming(self, n):
+        """Up to n distinct ids in the order next() would return them now."""
+        self._prune()
+        taken = []
+        while len(taken) < n:
+            self._prune()
+            if not self._heap:
+                break
+            taken.append(heapq.heappop(self._heap))
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        due = [card_id for when, _, card_id in taken if when <= self.clock]
+        later = [card_id for when, _, card_id in taken if when > self.clock]
+        fresh = list(islice((card_id for card_id in self._new if is_new(self.cards[card_id])), n))
+        rest = fresh + later if self._can_introduce() else later + fresh
+        return (due + rest)[:n]
+
+    def review(self, card_id, correct):
+        """Record an answer and reschedule the card."""
+        s = self.schedule
+        self.add(card_id)
+        card = self.cards[card_id]
+        self.clock += 1
+        if correct:
+            if card.reps == 0:
+                card.interval = s["firstInterval"]
+            elif card.reps == 1:
+                card.interval = s["secondInterval"]
+            else:
+                card.interval = max(card.interval + 1, card.interval * card.ease // 1000)
+            card.reps += 1
+            card.ease += s["easeBonus"]
+        else:
+            card.interval = s["lapseInterval"]
+            card.reps = 0
+            card.lapses += 1
+            card.ease = max(s["minEase"], card.ease - s["easePenalty"])
+        card.due = self.clock + card.interval
+        if card.reps == 0:
+            self._learning.add(card_id)
+        else:
+            self._learning.discard(card_id)
+        self._push(card_id)
+
+    def to_json(self):
+        """{"clock", "cards": {id: [ease, interval, reps, due, lapses]}}, as the page saves it."""
+        return {"clock": self.clock, "cards": {card_id: card.to_list() for card_id, card in self.cards.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a chapter through the scheduler.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help="cleaned deck JSON")
+    parser.add_argument("--chapter", default="Chapter1")
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance of a correct answer")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ids = [card["id"] for card in iter_clean_deck(args.input)
+           if (card.get("chapter") or "Chapter1") == args.chapter]
+    if not ids:
+        parser.error(f"no cards in {args.chapter}")
+
+    rng = random.Random(args.seed)
+    scheduler = Scheduler(ids)
+    for _ in range(args.reviews):
+        scheduler.review(scheduler.next(), rng.random() < args.accuracy)
+
+    reps = Counter(card.reps for card in scheduler.cards.values())
+    seen = sum(1 for card in scheduler.cards.values() if card.reps or card.lapses)
+    print(f"{args.chapter}: {len(ids)} cards, {args.reviews} reviews, {seen} seen")
+    print("correct in a row: " + ", ".join(f"{n}: {count}" for n, count in sorted(reps.items())))
+    print(f"next up: {', '.join(scheduler.upcoming(5))}")
+    print(json.dumps(scheduler.to_json())[:200] + " ...")
+
+
+if __name__ == "__main__":
+    main()
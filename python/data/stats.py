@@ -0,0 +1,221 @@
+"""
+Deck statistics, fast enough to run as a pre-publish gate on every build.
+
+Reads any deck the project produces: raw or cleaned JSON (flat or nested
+per-chapter lists, streamed) and .deck files (aggregated straight from
+their columns, without materialising cards).  Cards are reduced to a few
+columns first, then counted per chapter:
+
+    cards, words, phrases, form coverage (words with forms), raw fallback
+    rate ({"raw": ...} forms), average front/back length, duplicate rate
+    (normalized fronts seen before, across the whole deck)
+
+Usage: python stats.py DECK [--format json|csv|text] [--out FILE]
+           [--max-duplicate-rate R] [--max-raw-rate R]
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from array import array
+from collections import Counter
+
+from datacreation import iter_clean_deck
+from dedup import normalize
+from deckformat import FORMS_DICT, FORMS_RAW, MAGIC, Deck
+
+INPUT_FILE = "all_chapters_clean.json"
+CSV_FIELDS = ("chapter", "cards", "words", "phrases", "form_coverage", "raw_rate",
+              "avg_front", "avg_back", "duplicate_rate")
+
+# forms column values, as in deckformat.py
+FORMS_NONE = 0
+
+
+class Columns:
+    """The per-card values the statistics need, one array per field."""
+
+    def __init__(self):
+        self.chapter = []
+        self.type = []
+        self.forms = array("B")
+        self.front_len = array("I")
+        self.back_len = array("I")
+        self.duplicate = array("B")
+
+
+def _forms_kind(forms):
+    if not forms:
+        return FORMS_NONE
+    return FORMS_RAW if "raw" in forms else FORMS_DICT
+
+
+def json_columns(path):
+    columns = Columns()
+    seen = set()
+    for card in iter_clean_deck(path):
+        front = card.get("front") or ""
+        key = normalize(front)
+        columns.chapter.append(card.get("chapter") or "Chapter1")
+        columns.type.append(card.get("type"))
+        columns.forms.append(_forms_kind(card.get("forms")))
+        columns.front_len.append(len(front))
+        columns.back_len.append(len(card.get("back") or ""))
+        columns.duplicate.append(key in seen)
+        seen.add(key)
+    return columns
+
+
+def deck_columns(path):
+    """Columns of a .deck file; each distinct string is decoded once."""
+    columns = Columns()
+    with Deck(path) as deck:
+        for chapter in deck.chapters:
+            columns.chapter.extend([chapter] * len(deck.chapter_range(chapter)))
+        strings = {}
+
+        def text(idx):
+            if idx not in strings:
+                strings[idx] = deck.string(idx) or ""
+            return strings[idx]
+
+        def lengths(name):
+            if not deck.has_column(name):
+                return array("I", [0]) * len(deck)
+            return array("I", (len(text(idx)) for idx in deck.column(name)))
+
+        if deck.has_column("type"):
+            columns.type = [text(idx) or None for idx in deck.column("type")]
+        else:
+            columns.type = [None] * len(deck)
+        columns.forms = array("B", (kind & (FORMS_RAW | FORMS_DICT) for kind in deck.column("forms")))
+        columns.front_len = lengths("front")
+        columns.back_len = lengths("back")
+
+        keys = {}
+        seen = set()
+        for idx in deck.column("front"):
+            if idx not in keys:
+                keys[idx] = normalize(text(idx))
+            columns.duplicate.append(keys[idx] in seen)
+            seen.add(keys[idx])
+    return columns
+
+
+def load_columns(path):
+    with open(path, "rb") as f:
+        is_deck = f.read(len(MAGIC)) == MAGIC
+    return deck_columns(path) if is_deck else json_columns(path)
+
+
+def _summary(cards, types, forms, front_len, back_len, duplicates):
+    words = types.get("word", 0)
+    with_forms = forms[FORMS_DICT] + forms[FORMS_RAW]
+    return {
+        "cards": cards,
+        "words": words,
+        "phrases": types.get("phrase", 0),
+        "types": dict(types),
+        "form_coverage": round(with_forms / words, 4) if words else 0.0,
+        "raw_rate": round(forms[FORMS_RAW] / with_forms, 4) if with_forms else 0.0,
+        "avg_front": round(front_len / cards, 2) if cards else 0.0,
+        "avg_back": round(back_len / cards, 2) if cards else 0.0,
+        "duplicate_rate": round(duplicates / cards, 4) if cards else 0.0,
+    }
+
+
+def deck_stats(path):
+    """Statistics of one deck: {"total": {...}, "chapters": {chapter: {...}}}."""
+    columns = load_columns(path)
+
+    chapter_types = Counter(zip(columns.chapter, columns.type))
+    chapter_forms = Counter(zip(columns.chapter, columns.forms))
+    front_len, back_len, duplicates = Counter(), Counter(), Counter()
+    for chapter, flen, blen, dup in zip(columns.chapter, columns.front_len, columns.back_len, columns.duplicate):
+        front_len[chapter] += flen
+        back_len[chapter] += blen
+        duplicates[chapter] += dup
+
+    chapters = {}
+    for chapter, cards in Counter(columns.chapter).items():
+        types = {t: n for (c, t), n in chapter_types.items() if c == chapter}
+        forms = Counter({k: n for (c, k), n in chapter_forms.items() if c == chapter})
+        chapters[chapter] = _summary(cards, types, forms, front_len[chapter], back_len[chapter], duplicates[chapter])
+
+    total = _summary(
+        len(columns.chapter), Counter(columns.type), Counter(columns.forms),
+        sum(columns.front_len), sum(columns.back_len), sum(columns.duplicate),
+    )
+    return {"deck": str(path), "total": total, "chapters": chapters}
+
+
+def chapter_sort_key(chapter):
+    digits = "".join(ch for ch in chapter if ch.isdigit())
+    return (int(digits) if digits else float("inf"), chapter)
+
+
+def to_csv(stats):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for chapter in sorted(stats["chapters"], key=chapter_sort_key):
+        writer.writerow({"chapter": chapter, **stats["chapters"][chapter]})
+    writer.writerow({"chapter": "TOTAL", **stats["total"]})
+    return out.getvalue()
+
+
+def to_text(stats):
+    lines = [f"{chapter}: {stats['chapters'][chapter]['cards']} items"
+             for chapter in sorted(stats["chapters"], key=chapter_sort_key)]
+    total = stats["total"]
+    lines.append("")
+    lines.append(f"Total entries: {total['cards']}")
+    lines.append(f"Words with forms: {total['form_coverage']:.1%}, raw fallbacks: {total['raw_rate']:.1%}, "
+                 f"duplicates: {total['duplicate_rate']:.1%}")
+    lines.append(f"Average length: front {total['avg_front']}, back {total['avg_back']}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-chapter statistics for a deck.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help="deck JSON or .deck file")
+    parser.add_argument("--format", choices=("json", "csv", "text"), default="text")
+    parser.add_argument("--out", help="write to a file instead of stdout")
+    parser.add_argument("--max-duplicate-rate", type=float, help="exit 1 if the duplicate rate is higher")
+    parser.add_argument("--max-raw-rate", type=float, help="exit 1 if the raw fallback rate is higher")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = deck_stats(args.input)
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+
+    if args.format == "json":
+        output = json.dumps(stats, ensure_ascii=False, indent=2) + "\n"
+    elif args.format == "csv":
+        output = to_csv(stats)
+    else:
+        output = to_text(stats)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+    total = stats["total"]
+    failures = []
+    if args.max_duplicate_rate is not None and total["duplicate_rate"] > args.max_duplicate_rate:
+        failures.append(f"duplicate rate {total['duplicate_rate']:.2%} > {args.max_duplicate_rate:.2%}")
+    if args.max_raw_rate is not None and total["raw_rate"] > args.max_raw_rate:
+        failures.append(f"raw fallback rate {total['raw_rate']:.2%} > {args.max_raw_rate:.2%}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Synthetic decks at any size, shaped like the real ones, for benchmarks.
+
+Cards come out in the raw schema ({"front", "back", "chapter"}) with
+roughly the mix of all_chapters_raw.json: nouns and verbs with their
+inflection in parentheses ("sten (-en, -ar, -arna)", "ringa (-er, -de,
+-t)", "bror (-n, bröder, bröderna)"), bare words, short phrases and
+whole sentences, CHAPTER_SIZE cards per chapter.  Swedish-looking words
+are built from syllables and English backs from small word lists, so
+strings vary like real vocabulary instead of repeating.  The same seed
+always gives the same deck.
+
+Usage: python synthdeck.py SIZE [--seed 0] [--out synthetic-SIZE.json]
+           SIZE is a card count such as 5000, 10k or 1m
+"""
+
+import argparse
+import json
+import random
+
+CHAPTER_SIZE = 150
+
+# Share of each kind of card; the rest are bare words
+KINDS = (("noun", 0.38), ("verb", 0.18), ("uncountable", 0.05), ("phrase", 0.14), ("sentence", 0.12))
+
+ONSETS = ("b", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v",
+          "bl", "br", "fl", "fr", "gr", "kl", "kr", "sk", "sl", "sm", "sn", "sp", "st", "str", "sv", "tr")
+VOWELS = ("a", "e", "i", "o", "u", "y", "å", "ä", "ö")
+CODAS = ("", "", "d", "g", "k", "l", "m", "n", "r", "s", "t", "ck", "ng", "nd", "rt", "st", "ll")
+
+# (front suffixes, ending the stem must have or "")
+NOUN_CLASSES = (
+    (("-en", "-ar", "-arna"), ""),
+    (("-en", "-er", "-erna"), ""),
+    (("-n", "-or", "-orna"), "a"),
+    (("-n", "–", "-na"), "e"),
+    (("-et", "–", "-en"), ""),
+)
+VERB_CLASSES = (("-r", "-de", "-t"), ("-er", "-te", "-t"), ("-er", "-de", "-t"))
+# Written out in full, as the decks do for irregular words
+IRREGULAR = (("springa (-er, sprang, sprungit)", "run"), ("må (mår, mådde, mått)", "feel"),
+             ("ge (-r, gav, gett)", "give"), ("bror (-n, bröder, bröderna)", "brother"),
+             ("väder (vädret, väder, vädren)", "weather"))
+
+EN_NOUNS = ("student", "teacher", "stone", "kitchen", "garden", "car", "skirt", "recipe", "city", "color",
+            "window", "brother", "roof", "theory", "owner", "coat", "train", "letter", "forest", "question")
+EN_VERBS = ("climb", "call", "fish", "skate", "hang out", "continue", "arrange", "read", "write", "cook",
+            "open", "wait", "travel", "answer", "build", "sing", "learn", "remember", "borrow", "forget")
+EN_ADJECTIVES = ("big", "small", "new", "old", "lively", "quiet", "red", "cold", "early", "strange")
+SV_PREPOSITIONS = ("på", "i", "under", "efter", "med", "från", "till")
+EN_PREPOSITIONS = ("on", "in", "under", "after", "with", "from", "to")
+SENTENCES = (
+    ("Jag har en {noun}.", "I have a {en}."),
+    ("Var är {noun}en?", "Where is the {en}?"),
+    ("Kan du {verb} nu?", "Can you {ev} now?"),
+    ("Vi ska {verb} i morgon.", "We will {ev} tomorrow."),
+    ("Hur {adjective} är den?", "How {ea} is it?"),
+)
+
+
+def parse_size(text):
+    """"10k" -> 10000, "1m" -> 1000000, "2500" -> 2500."""
+    text = str(text).strip().lower()
+    scale = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def size_label(size):
+    for unit, scale in (("m", 1000000), ("k", 1000)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+class DeckGenerator:
+    """Seeded source of synthetic raw cards."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self._kinds = [kind for kind, _ in KINDS]
+        self._weights = [weight for _, weight in KINDS]
+        self._kinds.append("word")
+        self._weights.append(1 - sum(self._weights))
+
+    def stem(self, syllables=None):
+        rng = self.rng
+        syllables = syllables or rng.choice((1, 1, 2, 2, 2, 3))
+        return "".join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS) for _ in range(syllables))
+
+    def english(self, words, alternatives=0.15):
+        rng = self.rng
+        back = rng.choice(words)
+        if rng.random() < 0.3:
+            back = f"{rng.choice(EN_ADJECTIVES)} {back}"
+        if rng.random() < alternatives:
+            back += f", {rng.choice(words)}"
+        return back
+
+    def noun(self):
+        suffixes, ending = self.rng.choice(NOUN_CLASSES)
+        return f"{self.stem()}{ending} ({', '.join(suffixes)})", self.english(EN_NOUNS)
+
+    def verb(self):
+        if self.rng.random() < 0.05:
+            return self.rng.choice(IRREGULAR)
+        return f"{self.stem()}a ({', '.join(self.rng.choice(VERB_CLASSES))})", self.english(EN_VERBS, 0.05)
+
+    def uncountable(self):
+        return f"{self.stem()} (-en)", self.english(EN_NOUNS, 0)
+
+    def phrase(self):
+        i = self.rng.randrange(len(SV_PREPOSITIONS))
+        return f"{SV_PREPOSITIONS[i]} {self.stem()}et", f"{EN_PREPOSITIONS[i]} the {self.rng.choice(EN_NOUNS)}"
+
+    def sentence(self):
+        rng = self.rng
+        front, back = rng.choice(SENTENCES)
+        words = {"noun": self.stem(), "verb": self.stem() + "a", "adjective": self.stem(1),
+                 "en": rng.choice(EN_NOUNS), "ev": rng.choice(EN_VERBS), "ea": rng.choice(EN_ADJECTIVES)}
+        return front.format(**words), back.format(**words)
+
+    def word(self):
+        return self.stem(), self.english(EN_ADJECTIVES + EN_NOUNS)
+
+    def cards(self, size):
+        """size raw cards, CHAPTER_SIZE per chapter."""
+        makers = {kind: getattr(self, kind) for kind in self._kinds}
+        kinds = self.rng.choices(self._kinds, self._weights, k=size)
+        for n, kind in enumerate(kinds):
+            front, back = makers[kind]()
+            yield {"front": front, "back": back, "chapter": f"Chapter{n // CHAPTER_SIZE + 1}"}
+
+
+def generate(size, seed=0):
+    """A synthetic raw deck of `size` cards as a list."""
+    return list(DeckGenerator(seed).cards(size))
+
+
+def write_deck(size, path, seed=0):
+    """Stream a synthetic deck to path as a JSON array; returns the card count."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for n, card in enumerate(DeckGenerator(seed).cards(size)):
+            f.write(("," if n else "") + json.dumps(card, ensure_ascii=False))
+        f.write("]")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic raw deck for benchmarks.")
+    parser.add_argument("size", help="card count, e.g. 10k, 100k, 1m")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output path (default synthetic-SIZE.json)")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    out = args.out or f"synthetic-{size_label(size)}.json"
+    write_deck(size, out, args.seed)
+    print(f"✅ {size} synthetic cards in {-(-size // CHAPTER_SIZE)} chapters written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Fast, seeded dungeon floor generator.
+
+Produces the same floors as the pages' generateDungeon (for the same random
+stream), but the map is a row-major bytearray (WALL = 0, FLOOR = 1):
+
+  - rooms and corridors are carved with slice assignment (a room row, a
+    horizontal run, a vertical run as a stepped slice) instead of cell by cell
+  - overlap checks are one AND against an integer bitmask of the claimed
+    cells instead of a loop over every placed room
+  - floor cells are collected from runs of FLOOR bytes
+
+A floor is fully determined by (seed, floor) through floor_rng().
+
+Layouts: "template" (templates/dungeon, from dungeon_rules.py) and the
+"mobile" / "desktop" grids of index.html.
+
+Usage: python dungeon_gen.py [--layout desktop] [--count 100000] [--seed 0] [--show]
+"""
+
+import argparse
+import random
+import re
+import time
+from collections import namedtuple
+
+from dungeon_rules import RULES
+
+WALL, FLOOR = 0, 1
+FLOOR_STRIDE = 1 << 20  # floors per seed before two seeds' streams could meet
+
+Room = namedtuple("Room", "x y width height")
+
+# attempts: room placement tries per wanted room (index.html retries up to
+# 20x; the template tries each room once).  min_rooms: regenerate below this.
+Layout = namedtuple("Layout", "size rooms_min rooms_extra room_size room_range attempts min_rooms")
+
+
+def template_layout(rules=RULES):
+    rooms = rules["rooms"]
+    return Layout(rules["gridSize"], rooms["min"], rooms["extra"], rooms["size"], rooms["sizeRange"], 1, 0)
+
+
+LAYOUTS = {
+    "template": template_layout(),
+    "mobile": Layout(12, 5, 2, 2, 2, 20, 3),
+    "desktop": Layout(30, 10, 4, 4, 4, 20, 3),
+}
+
+_FLOOR_RUN = re.compile(b"\x01+")
+_REPEATS = {}
+
+
+def _row_repeat(size):
+    """repeat[n] has bit 0 of each of the first n rows set; times a row mask it stacks n rows."""
+    if size not in _REPEATS:
+        repeat = [0]
+        for row in range(size + 1):
+            repeat.append(repeat[-1] | 1 << (row * size))
+        _REPEATS[size] = repeat
+    return _REPEATS[size]
+
+
+def floor_rng(seed, floor):
+    """The random stream of one floor of one seeded game."""
+    return random.Random(seed * FLOOR_STRIDE + floor)
+
+
+def _generate_once(rng, layout):
+    size = layout.size
+    grid = bytearray(size * size)
+    occupied = 0  # bit y * size + x set where a room (plus its padding) lies
+    rooms = []
+    rand = rng.random
+    room_size, room_range = layout.room_size, layout.room_range
+    repeat = _row_repeat(size)
+
+    num_rooms = layout.rooms_min + int(rand() * layout.rooms_extra)
+    for _ in range(num_rooms * layout.attempts):
+        width = room_size + int(rand() * room_range)
+        height = room_size + int(rand() * room_range)
+        x = 1 + int(rand() * (size - width - 2))
+        y = 1 + int(rand() * (size - height - 2))
+
+        # Rooms keep one tile apart: a room claims its rectangle plus the
+        # column to its right and the row below it, tested in one AND
+        claim = ((((1 << (width + 1)) - 1) << x) * repeat[height + 1]) << (y * size)
+        if occupied & claim:
+            continue
+
+        occupied |= claim
+        rooms.append(Room(x, y, width, height))
+        run = b"\x01" * width
+        for row in range(y * size + x, (y + height) * size + x, size):
+            grid[row:row + width] = run
+        if len(rooms) == num_rooms:
+            break
+
+    # L-shaped corridors between consecutive rooms, horizontal then vertical
+    for room1, room2 in zip(rooms, rooms[1:]):
+        x1, y1 = room1.x + room1.width // 2, room1.y + room1.height // 2
+        x2, y2 = room2.x + room2.width // 2, room2.y + room2.height // 2
+        row = y1 * size
+        if x2 > x1:
+            grid[row + x1:row + x2] = b"\x01" * (x2 - x1)
+        elif x1 > x2:
+            grid[row + x2 + 1:row + x1 + 1] = b"\x01" * (x1 - x2)
+        if y2 > y1:
+            grid[y1 * size + x2:y2 * size + x2:size] = b"\x01" * (y2 - y1)
+        elif y1 > y2:
+            grid[(y2 + 1) * size + x2:(y1 + 1) * size + x2:size] = b"\x01" * (y1 - y2)
+
+    return grid, rooms
+
+
+def generate(rng, layout=LAYOUTS["template"]):
+    """(grid, rooms) for one floor from an existing random stream."""
+    while True:
+        grid, rooms = _generate_once(rng, layout)
+        if len(rooms) >= layout.min_rooms:
+            return grid, rooms
+
+
+def generate_floor(seed, floor, layout=LAYOUTS["template"]):
+    return generate(floor_rng(seed, floor), layout)
+
+
+def floor_cells(grid):
+    """Indexes (y * size + x) of every FLOOR cell, in row-major order."""
+    cells = []
+    for run in _FLOOR_RUN.finditer(grid):
+        cells.extend(range(run.start(), run.end()))
+    return cells
+
+
+def render_ascii(grid, size):
+    return "\n".join(
+        grid[row:row + size].translate(bytes.maketrans(b"\x00\x01", b"#.")).decode("ascii")
+        for row in range(0, size * size, size)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-generate seeded dungeon floors.")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="desktop")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show", action="store_true", help="print the first floor")
+    args = parser.parse_args()
+
+    layout = LAYOUTS[args.layout]
+    floor_area = 0
+    start = time.perf_counter()
+    for floor in range(1, args.count + 1):
+        grid, _ = generate_floor(args.seed, floor, layout)
+        floor_area += len(floor_cells(grid))
+    elapsed = time.perf_counter() - start
+
+    if args.show:
+        print(render_ascii(generate_floor(args.seed, 1, layout)[0], layout.size))
+    print(f"{args.count} {layout.size}x{layout.size} floors in {elapsed:.2f}s "
+          f"({args.count / elapsed:,.0f} floors/s), {floor_area / args.count / layout.size ** 2:.0%} floor")
+
+
+if __name__ == "__main__":
+    main()
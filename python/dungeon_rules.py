@@ -0,0 +1,38 @@
+"""
+Rules of the template dungeon game, in one place.
+
+pagebuilder.py inlines RULES into templates/dungeon/game.js (the {{RULES}}
+slot) and dungeon_sim.py plays by the same numbers, so balancing changes
+are made here and reach both the page and the simulator.
+"""
+
+import json
+
+RULES = {
+    "gridSize": 15,
+    "visionRadius": 3,
+    "player": {"hp": 100, "level": 1},
+    # rooms: min + randint(0, extra - 1) attempts, sides of size..size + sizeRange - 1
+    "rooms": {"min": 4, "extra": 3, "size": 3, "sizeRange": 4},
+    "monstersBase": 3,          # monsters per floor = monstersBase + floor
+    "floorScaleStep": 0.2,      # monster hp/damage x (1 + (floor - 1) * step)
+    "streakBonus": 0.5,         # damage x (1 + streak * bonus)
+    "baseDamage": 10,
+    "damagePerLevel": 5,
+    "xpPerLevel": 100,          # xp for the next level = level * xpPerLevel
+    "hpPerLevel": 20,
+    # A monster type can appear from its minFloor on
+    "monsterTypes": [
+        {"name": "Slime", "emoji": "🟢", "hp": 30, "damage": 5, "xp": 15, "gold": 5, "minFloor": 1},
+        {"name": "Goblin", "emoji": "👺", "hp": 40, "damage": 8, "xp": 25, "gold": 10, "minFloor": 1},
+        {"name": "Skeleton", "emoji": "💀", "hp": 50, "damage": 10, "xp": 35, "gold": 15, "minFloor": 2},
+        {"name": "Ghost", "emoji": "👻", "hp": 35, "damage": 12, "xp": 40, "gold": 20, "minFloor": 3},
+        {"name": "Orc", "emoji": "👹", "hp": 70, "damage": 15, "xp": 50, "gold": 25, "minFloor": 4},
+        {"name": "Dragon", "emoji": "🐉", "hp": 100, "damage": 20, "xp": 100, "gold": 50, "minFloor": 5},
+    ],
+}
+
+
+def rules_js(rules=RULES):
+    """RULES as a JS object literal."""
+    return json.dumps(rules, ensure_ascii=False, indent=4).replace("\n", "\n        ")
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Headless simulator for the template dungeon game.
+
+A Python port of the rules in templates/dungeon/game.js (generateDungeon,
+via dungeon_gen.py, initFloor, floorScale/minFloor monster scaling, the
+streak multiplier and the getXpForNextLevel curve), playing by the numbers
+in dungeon_rules.py.
+Every run is reproducible from its seed.
+
+The simulated player walks the shortest path to the stairs, fights every
+monster on the way and answers each card correctly with the probability
+given by an accuracy model.  Runs are spread over a process pool and
+summarised: win rate, floors reached and cards seen per floor.
+
+With --deck, every card shown is the next one due in that floor's chapter
+(data/scheduler.py, the schedule index.html uses), and each correct answer
+to a card adds --learn to the chance of knowing it next time; the summary
+then also counts distinct cards seen and cards learned per run.
+
+Usage: python dungeon_sim.py [--runs 10000] [--accuracy 0.8] [--decay 0.01]
+           [--max-floors 24] [--workers N] [--seed 0] [--json report.json]
+           [--deck all_chapters_clean.json] [--learn 0.05]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from dungeon_gen import FLOOR, floor_cells, generate, template_layout
+from dungeon_rules import RULES
+
+# Shared deck tooling lives next to the data files
+sys.path.insert(0, str(Path(__file__).parent / "data"))
+
+from datacreation import iter_clean_deck  # noqa: E402
+from scheduler import Scheduler  # noqa: E402
+
+DEFAULT_MAX_FLOORS = 24
+CHUNK_RUNS = 500
+LEARNED_REPS = 2  # correct answers in a row for a card to count as learned
+
+
+class AccuracyModel(namedtuple("AccuracyModel", "base decay learn", defaults=(0.0,))):
+    """
+    Chance of a correct answer: base, minus decay for every floor below the
+    first, plus learn for every correct answer in a row the card has had.
+    """
+
+    def chance(self, floor, reps=0):
+        return min(1.0, max(0.0, self.base - self.decay * (floor - 1) + self.learn * reps))
+
+
+def load_deck(path):
+    """Card ids per chapter, in the order the pages sort chapters."""
+    chapters = {}
+    for card in iter_clean_deck(path):
+        chapters.setdefault(card.get("chapter") or "Chapter1", []).append(card["id"])
+    return [chapters[chapter] for chapter in sorted(chapters)]
+
+
+# ============================================
+# FLOORS
+# ============================================
+def init_floor(rng, floor, rules=RULES):
+    """Player start, stairs and monsters for one floor, placed as initFloor does."""
+    size = rules["gridSize"]
+    grid, rooms = generate(rng, template_layout(rules))
+    cells = floor_cells(grid)
+
+    if rooms:
+        start = (rooms[0].y + 1) * size + rooms[0].x + 1
+    else:
+        start = cells[0]
+    available = [cell for cell in cells if cell != start]
+
+    if len(rooms) > 1:
+        last = rooms[-1]
+        stairs = (last.y + last.height // 2) * size + last.x + last.width // 2
+    else:
+        stairs = available[-1]
+
+    monster_cells = [cell for cell in available if cell != stairs]
+    eligible = [m for m in rules["monsterTypes"] if m["minFloor"] <= floor]
+    scale = 1 + (floor - 1) * rules["floorScaleStep"]
+    monsters = {}
+    for _ in range(min(rules["monstersBase"] + floor, len(monster_cells))):
+        cell = monster_cells.pop(int(rng.random() * len(monster_cells)))
+        kind = eligible[int(rng.random() * len(eligible))]
+        monsters[cell] = {
+            "type": rules["monsterTypes"].index(kind),
+            "hp": int(kind["hp"] * scale),
+            "damage": int(kind["damage"] * scale),
+            "xp": kind["xp"],
+            "gold": kind["gold"],
+        }
+    return grid, start, stairs, monsters
+
+
+def shortest_path(grid, size, start, goal):
+    """Cells from start (exclusive) to goal (inclusive), or None."""
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            break
+        x = cell % size
+        for nxt, ok in ((cell - size, cell >= size), (cell + size, cell < len(grid) - size),
+                        (cell - 1, x > 0), (cell + 1, x < size - 1)):
+            if ok and grid[nxt] == FLOOR and nxt not in previous:
+                previous[nxt] = cell
+                queue.append(nxt)
+    if goal not in previous:
+        return None
+    path = []
+    while goal != start:
+        path.append(goal)
+        goal = previous[goal]
+    return path[::-1]
+
+
+# ============================================
+# PLAYING
+# ============================================
+class Player:
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self.hp = self.max_hp = rules["player"]["hp"]
+        self.level = rules["player"]["level"]
+        self.xp = 0
+        self.gold = 0
+        self.streak = 0
+
+    def xp_for_next_level(self):
+        return self.level * self.rules["xpPerLevel"]
+
+    def fight(self, monster, answer):
+        """Answer cards (answer() -> correct?) until one side drops; returns the number of cards seen."""
+        rules = self.rules
+        cards = 0
+        hp = monster["hp"]
+        while True:
+            cards += 1
+            if answer():
+                self.streak += 1
+                damage = int((rules["baseDamage"] + self.level * rules["damagePerLevel"])
+                             * (1 + self.streak * rules["streakBonus"]))
+                hp -= damage
+                if hp <= 0:
+                    self.defeat(monster)
+                    return cards
+            else:
+                self.streak = 0
+                self.hp -= monster["damage"]
+                if self.hp <= 0:
+                    return cards
+
+    def defeat(self, monster):
+        self.xp += monster["xp"]
+        self.gold += monster["gold"]
+        while self.xp >= self.xp_for_next_level():
+            self.xp -= self.xp_for_next_level()
+            self.level += 1
+            self.max_hp += self.rules["hpPerLevel"]
+            self.hp = self.max_hp
+
+
+def scheduled_answers(rng, model, floor, scheduler):
+    """answer() that reviews the chapter's next due card."""
+    def answer():
+        card_id = scheduler.next()
+        correct = rng.random() < model.chance(floor, scheduler.cards[card_id].reps)
+        scheduler.review(card_id, correct)
+        return correct
+    return answer
+
+
+def simulate_run(seed, model, max_floors=DEFAULT_MAX_FLOORS, rules=RULES, deck=None):
+    """
+    One game from floor 1; returns (floor reached, won, cards seen per
+    floor, schedulers by chapter index - empty without a deck).
+    """
+    rng = random.Random(seed)
+    player = Player(rules)
+    size = rules["gridSize"]
+    cards_per_floor = []
+    schedulers = {}
+
+    for floor in range(1, max_floors + 1):
+        grid, start, stairs, monsters = init_floor(rng, floor, rules)
+        if deck:
+            chapter = (floor - 1) % len(deck)
+            if chapter not in schedulers:
+                schedulers[chapter] = Scheduler(deck[chapter])
+            answer = scheduled_answers(rng, model, floor, schedulers[chapter])
+        else:
+            chance = model.chance(floor)
+            answer = lambda: rng.random() < chance  # noqa: E731
+        cards = 0
+        for cell in shortest_path(grid, size, start, stairs):
+            monster = monsters.get(cell)
+            if monster:
+                cards += player.fight(monster, answer)
+                if player.hp <= 0:
+                    cards_per_floor.append(cards)
+                    return floor, False, cards_per_floor, schedulers
+        cards_per_floor.append(cards)
+    return max_floors, True, cards_per_floor, schedulers
+
+
+def simulate_chunk(args):
+    """Partial totals for runs first_seed .. first_seed + runs - 1 (one pool task)."""
+    first_seed, runs, model, max_floors, rules, deck = args
+    wins = 0
+    reached = []
+    cards = [0] * max_floors
+    visits = [0] * max_floors
+    seen = learned = 0
+    for seed in range(first_seed, first_seed + runs):
+        floor, won, per_floor, schedulers = simulate_run(seed, model, max_floors, rules, deck)
+        wins += won
+        reached.append(floor)
+        for i, n in enumerate(per_floor):
+            cards[i] += n
+            visits[i] += 1
+        for scheduler in schedulers.values():
+            for card in scheduler.cards.values():
+                seen += bool(card.reps or card.lapses)
+                learned += card.reps >= LEARNED_REPS
+    return wins, reached, cards, visits, seen, learned
+
+
+def simulate(runs, model, max_floors=DEFAULT_MAX_FLOORS, workers=None, seed=0, rules=RULES, deck=None):
+    """Summary of `runs` games with seeds seed .. seed + runs - 1."""
+    start = time.perf_counter()
+    tasks = [(first, min(CHUNK_RUNS, seed + runs - first), model, max_floors, rules, deck)
+             for first in range(seed, seed + runs, CHUNK_RUNS)]
+
+    wins = 0
+    reached = []
+    cards = [0] * max_floors
+    visits = [0] * max_floors
+    seen = learned = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_wins, chunk_reached, chunk_cards, chunk_visits, chunk_seen, chunk_learned \
+                in pool.map(simulate_chunk, tasks):
+            wins += chunk_wins
+            reached.extend(chunk_reached)
+            cards = [a + b for a, b in zip(cards, chunk_cards)]
+            visits = [a + b for a, b in zip(visits, chunk_visits)]
+            seen += chunk_seen
+            learned += chunk_learned
+    elapsed = time.perf_counter() - start
+
+    floors_played = sum(visits)
+    deaths = {}
+    for floor in reached:
+        deaths[floor] = deaths.get(floor, 0) + 1
+    summary = {
+        "runs": runs,
+        "accuracy": model._asdict(),
+        "max_floors": max_floors,
+        "win_rate": round(wins / runs, 4),
+        "floors_reached": {
+            "mean": round(statistics.fmean(reached), 2),
+            "median": statistics.median(reached),
+            "histogram": dict(sorted(deaths.items())),
+        },
+        "cards_per_floor": {
+            floor: round(cards[floor - 1] / visits[floor - 1], 2)
+            for floor in range(1, max_floors + 1) if visits[floor - 1]
+        },
+        "floors_simulated": floors_played,
+        "seconds": round(elapsed, 2),
+        "floors_per_minute": int(floors_played / elapsed * 60),
+    }
+    if deck:
+        summary["cards_seen_per_run"] = round(seen / runs, 2)
+        summary["cards_learned_per_run"] = round(learned / runs, 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate dungeon runs with a player accuracy model.")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance of a correct answer on floor 1")
+    parser.add_argument("--decay", type=float, default=0.0, help="accuracy lost per floor")
+    parser.add_argument("--max-floors", type=int, default=DEFAULT_MAX_FLOORS, help="floors to clear for a win")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--json", help="write the summary to a file")
+    parser.add_argument("--deck", help="cleaned deck JSON: draw cards through the scheduler")
+    parser.add_argument("--learn", type=float, default=0.0,
+                        help="accuracy gained per correct answer in a row to a card (with --deck)")
+    args = parser.parse_args()
+
+    model = AccuracyModel(args.accuracy, args.decay, args.learn)
+    deck = load_deck(args.deck) if args.deck else None
+    summary = simulate(args.runs, model, args.max_floors, args.workers, args.seed, deck=deck)
+
+    print(f"🎲 {summary['runs']} runs, {summary['floors_simulated']} floors in {summary['seconds']}s "
+          f"({summary['floors_per_minute']:,} floors/min)")
+    print(f"   win rate: {summary['win_rate']:.1%}")
+    print(f"   floors reached: mean {summary['floors_reached']['mean']}, "
+          f"median {summary['floors_reached']['median']}")
+    print("   cards per floor: " + ", ".join(
+        f"{floor}: {cards}" for floor, cards in summary["cards_per_floor"].items()))
+    if deck:
+        print(f"   cards seen per run: {summary['cards_seen_per_run']}, "
+              f"learned: {summary['cards_learned_per_run']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"✅ Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
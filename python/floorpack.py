@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Pre-baked floor packs for the template dungeon game.
+
+For every floor of the first pass through the chapters, N layouts are
+generated with the game's own rules (dungeon_sim.init_floor), validated
+(every floor cell connected, stairs reachable and apart from the start,
+monsters only on free floor cells) and bit-packed:
+
+    grid        1 bit per cell, row-major, low bit first, padded to a byte
+    u16 start, u16 stairs                  cell index y * size + x
+    u8 monsters, then (u16 cell, u8 type)  type indexes RULES["monsterTypes"]
+
+written_standalone.py --floor-packs N inlines them as FLOOR_PACKS; the game
+then unpacks a layout instead of generating one, and names it ("3.2" =
+floor 3, layout 2) so a floor can be reproduced from a report.
+
+Usage: python floorpack.py CHAPTERS [--per-floor 8] [--seed 0]
+"""
+
+import argparse
+import base64
+import struct
+from collections import deque
+
+from dungeon_gen import FLOOR, floor_rng
+from dungeon_rules import RULES
+from dungeon_sim import init_floor
+
+DEFAULT_PER_FLOOR = 8
+MAX_PER_FLOOR = 1024
+MAX_TRIES = 100
+
+CELL_PAIR = struct.Struct("<HH")
+MONSTER = struct.Struct("<HB")
+
+
+def reachable(grid, size, start):
+    """Set of cells connected to start."""
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        x = cell % size
+        for nxt, ok in ((cell - size, cell >= size), (cell + size, cell < len(grid) - size),
+                        (cell - 1, x > 0), (cell + 1, x < size - 1)):
+            if ok and nxt not in seen and grid[nxt] == FLOOR:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+
+def is_valid(grid, size, start, stairs, monsters):
+    connected = reachable(grid, size, start)
+    return (
+        stairs != start
+        and stairs in connected
+        and len(connected) == grid.count(FLOOR)
+        and all(cell in connected and cell not in (start, stairs) for cell in monsters)
+        and len(monsters) < 256
+    )
+
+
+def pack_floor(grid, start, stairs, monsters):
+    bits = bytearray((len(grid) + 7) // 8)
+    for i, cell in enumerate(grid):
+        if cell == FLOOR:
+            bits[i >> 3] |= 1 << (i & 7)
+    out = bits + CELL_PAIR.pack(start, stairs) + bytes([len(monsters)])
+    for cell, monster in monsters.items():
+        out += MONSTER.pack(cell, monster["type"])
+    return base64.b64encode(bytes(out)).decode("ascii")
+
+
+def unpack_floor(data, size):
+    """(grid, start, stairs, [(cell, type), ...]); the inverse of pack_floor."""
+    raw = base64.b64decode(data)
+    cells = size * size
+    grid = bytearray((raw[i >> 3] >> (i & 7)) & 1 for i in range(cells))
+    pos = (cells + 7) // 8
+    start, stairs = CELL_PAIR.unpack_from(raw, pos)
+    count = raw[pos + CELL_PAIR.size]
+    pos += CELL_PAIR.size + 1
+    monsters = [MONSTER.unpack_from(raw, pos + i * MONSTER.size) for i in range(count)]
+    return grid, start, stairs, monsters
+
+
+def build_floor(floor, seed, variant, rules=RULES):
+    """One validated, packed layout; deterministic from (seed, floor, variant)."""
+    size = rules["gridSize"]
+    for attempt in range(MAX_TRIES):
+        rng = floor_rng((seed * MAX_PER_FLOOR + variant) * MAX_TRIES + attempt, floor)
+        grid, start, stairs, monsters = init_floor(rng, floor, rules)
+        if is_valid(grid, size, start, stairs, monsters):
+            return pack_floor(grid, start, stairs, monsters)
+    raise RuntimeError(f"no valid layout for floor {floor} after {MAX_TRIES} tries")
+
+
+def build_packs(floors, per_floor=DEFAULT_PER_FLOOR, seed=0, rules=RULES):
+    """FLOOR_PACKS for floors 1..floors: {"gridSize", "floors": {floor: [layout, ...]}}."""
+    if not 0 < per_floor <= MAX_PER_FLOOR:
+        raise ValueError(f"per_floor must be 1..{MAX_PER_FLOOR}")
+    return {
+        "gridSize": rules["gridSize"],
+        "floors": {
+            floor: [build_floor(floor, seed, variant, rules) for variant in range(per_floor)]
+            for floor in range(1, floors + 1)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate floor packs and report their size.")
+    parser.add_argument("floors", type=int, help="number of floors (one per chapter)")
+    parser.add_argument("--per-floor", type=int, default=DEFAULT_PER_FLOOR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    packs = build_packs(args.floors, args.per_floor, args.seed)
+    layouts = [layout for variants in packs["floors"].values() for layout in variants]
+    size = sum(len(layout) for layout in layouts)
+    print(f"{len(layouts)} layouts for {args.floors} floors: {size / 1024:.1f} KB of base64 "
+          f"({size / len(layouts):.0f} bytes each)")
+
+
+if __name__ == "__main__":
+    main()
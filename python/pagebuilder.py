@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Template-based, cached build for the dungeon pages.
+
+A variant is either a template directory under templates/ (page.html plus
+the style.css and game.js it inlines) or an existing hand-made page such
+as ../index.html, whose `const RAW_FLASHCARD_DATA = ...` line becomes the
+data slot.  Each variant is rendered once into a shell split around its
+data slots; building a deck only splices the data in.
+
+With --index the deck's accepted answer keys (answermatch.py) are
+inlined as DECK_INDEX next to the data; hand-made pages, which offer
+multiple choice, also get the same-type pools (deckindex.py) and ranked
+distractors (distractors.py).  With --floor-packs N, template pages also
+get N validated layouts per floor (floorpack.py) as FLOOR_PACKS.
+
+--embed gzip stores the deck gzip-compressed (compact.py) and inflates
+it in the browser, several times smaller than the JSON embed.
+
+Outputs are keyed by a content hash of shell, embed loader, data-block
+code, embed mode and deck, kept in .build-cache/outputs.json, so
+unchanged deck x variant pairs are skipped.
+
+Usage: python pagebuilder.py DECK.json [DECK.json ...] [--variant dungeon]
+           [--variant ../index.html] [--embed json|binary|shards|gzip] [--index] [--floor-packs N] [--out-dir build]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from html import escape
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+TEMPLATE_DIR = SCRIPT_DIR / "templates"
+CACHE_DIR = SCRIPT_DIR / ".build-cache"
+DEFAULT_VARIANT = "dungeon"
+EMBED_MODES = ("json", "binary", "shards", "gzip")
+BUILD_STAGES = ("load", "index", "render", "write")  # profiled by build()
+
+STYLE_SLOT = "{{STYLE}}"
+SCRIPT_SLOT = "{{SCRIPT}}"
+SHARD_SLOT = "{{SHARD_BLOCKS}}"
+DATA_SLOT = "{{DATA_BLOCK}}"
+RULES_SLOT = "{{RULES}}"
+
+# Hand-made pages carry their deck on one line
+PAGE_DATA_LINE = re.compile(r"^([ \t]*)const RAW_FLASHCARD_DATA = .*?;?[ \t]*(?=\r?$)", re.MULTILINE)
+
+# Shared deck tooling lives next to the data files
+sys.path.insert(0, str(SCRIPT_DIR / "data"))
+
+import compact  # noqa: E402
+import deckformat  # noqa: E402
+from answermatch import answer_table  # noqa: E402
+from datacreation import CLEANER_VERSION  # noqa: E402
+from deckindex import DeckIndex  # noqa: E402
+from distractors import distractor_table  # noqa: E402
+from dungeon_rules import rules_js  # noqa: E402
+from floorpack import build_packs  # noqa: E402
+from profiling import Profiler  # noqa: E402
+
+# Python that shapes data blocks; a change to any of them invalidates cached outputs
+DATA_BLOCK_MODULES = ("compact", "deckformat", "answermatch", "deckindex", "distractors",
+                      "floorpack", "dungeon_gen", "dungeon_sim", "dungeon_rules")
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8") if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class Shell:
+    """A rendered page split around its data slots."""
+
+    def __init__(self, name, text, lazy):
+        self.name = name
+        self.lazy = lazy  # template pages understand every embed mode
+        self.digest = _digest(text)
+        head, rest = text.split(SHARD_SLOT, 1) if SHARD_SLOT in text else ("", text)
+        middle, tail = rest.split(DATA_SLOT, 1)
+        self.parts = (head, middle, tail)
+
+    def splice(self, shard_blocks, data_block):
+        head, middle, tail = self.parts
+        return head + shard_blocks + middle + data_block + tail
+
+
+def render_template_shell(name, template_dir=TEMPLATE_DIR):
+    """Inline a template directory's assets (and the game rules) into a single shell."""
+    directory = Path(template_dir) / name
+    page = (directory / "page.html").read_text(encoding="utf-8")
+    style = (directory / "style.css").read_text(encoding="utf-8")
+    script = (directory / "game.js").read_text(encoding="utf-8").replace(RULES_SLOT, rules_js())
+    return Shell(name, page.replace(STYLE_SLOT, style).replace(SCRIPT_SLOT, script), lazy=True)
+
+
+def page_shell(path):
+    """Turn a hand-made page with an inlined deck into a shell."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    text, count = PAGE_DATA_LINE.subn(lambda m: m.group(1) + DATA_SLOT, text, count=1)
+    if not count:
+        raise ValueError(f"{path}: no `const RAW_FLASHCARD_DATA = ...` line to replace")
+    return Shell(Path(path).stem, text, lazy=False)
+
+
+def group_by_chapter(flashcard_data):
+    """Cards per chapter, in first-seen order (missing chapter -> Chapter1)."""
+    chapters = {}
+    for card in flashcard_data:
+        chapter = card.get("chapter") or "Chapter1"
+        chapters.setdefault(chapter, []).append({**card, "chapter": chapter})
+    return chapters
+
+
+def game_index(flashcard_data, choices=True):
+    """
+    DECK_INDEX for the game: answer keys per chapter and, with choices,
+    the same-type pools and ranked distractors multiple choice reads.
+    """
+    index = DeckIndex(flashcard_data)
+    if not choices:
+        return {"answers": answer_table(flashcard_data, index)}
+    return {
+        **index.game_index(),
+        "distractors": distractor_table(flashcard_data, index),
+        "answers": answer_table(flashcard_data, index),
+    }
+
+
+def script_json(value):
+    """JSON that is safe to place inside a <script> element."""
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+
+class PageBuilder:
+    """Renders decks into variants; shells and loaders are read once per builder."""
+
+    def __init__(self, template_dir=TEMPLATE_DIR, cache_dir=CACHE_DIR):
+        self.template_dir = Path(template_dir)
+        self.loader_dir = self.template_dir / "loaders"
+        self.cache_dir = Path(cache_dir)
+        self._shells = {}
+        self._loaders = {}
+        self._code_version = None
+        self._manifest = None
+
+    # --- shells and data blocks --------------------------------------
+    def shell(self, variant=DEFAULT_VARIANT):
+        if variant not in self._shells:
+            if (self.template_dir / variant / "page.html").exists():
+                self._shells[variant] = render_template_shell(variant, self.template_dir)
+            else:
+                self._shells[variant] = page_shell(variant)
+        return self._shells[variant]
+
+    def loader(self, embed):
+        if embed not in self._loaders:
+            self._loaders[embed] = (self.loader_dir / f"{embed}.js").read_text(encoding="utf-8")
+        return self._loaders[embed]
+
+    def data_block(self, flashcard_data, embed="json", lazy=True, index=False, floor_packs=None):
+        """
+        JS that defines the deck for the page (DECK_CHAPTERS/loadChapterCards
+        on template pages).  index is a flag or an already computed game_index().
+        """
+        index_statement = ""
+        if index:
+            index_value = index if isinstance(index, dict) else game_index(flashcard_data, choices=not lazy)
+            index_statement = f"const DECK_INDEX = {script_json(index_value)};"
+        if not lazy:
+            # Same compact, semicolon-free line the hand-made pages were written with
+            line = f"const RAW_FLASHCARD_DATA = {json.dumps(flashcard_data, ensure_ascii=False, separators=(',', ':'))}"
+            return f"{line}; {index_statement}" if index else line
+        if embed == "binary":
+            cards = [card for chapter in group_by_chapter(flashcard_data).values() for card in chapter]
+            statement = deckformat.js_decoder() + f'\nconst DECK = decodeDeck("{deckformat.deck_base64(cards)}");'
+        elif embed == "shards":
+            statement = f"const DECK_CHAPTERS = {script_json(list(group_by_chapter(flashcard_data)))};"
+        elif embed == "gzip":
+            chapters, blob = compact.chapter_blob(flashcard_data)
+            statement = f'const DECK_CHAPTERS = {script_json(chapters)};\nconst DECK_GZIP = "{blob}";'
+        else:
+            statement = f"const RAW_FLASHCARD_DATA = {json.dumps(flashcard_data, ensure_ascii=False)};"
+        if index:
+            statement += "\n" + index_statement
+        if floor_packs:
+            statement += f"\nconst FLOOR_PACKS = {script_json(floor_packs)};"
+        return statement + "\n" + self.loader(embed).rstrip("\n")
+
+    def shard_blocks(self, flashcard_data, embed="json"):
+        if embed != "shards":
+            return ""
+        return "\n".join(
+            f'<script type="application/json" id="deck-{escape(chapter)}">{script_json(cards)}</script>'
+            for chapter, cards in group_by_chapter(flashcard_data).items()
+        )
+
+    def render(self, flashcard_data, variant=DEFAULT_VARIANT, embed="json", index=False, floor_packs=None):
+        """The complete page for one deck and variant; floor_packs only reach template pages."""
+        if embed not in EMBED_MODES:
+            raise ValueError(f"embed must be one of {EMBED_MODES}, got {embed!r}")
+        shell = self.shell(variant)
+        if not shell.lazy and embed != "json":
+            raise ValueError(f"{shell.name}: hand-made pages only support embed='json'")
+        return shell.splice(
+            self.shard_blocks(flashcard_data, embed),
+            self.data_block(flashcard_data, embed, shell.lazy, index, floor_packs),
+        )
+
+    # --- cached builds -----------------------------------------------
+    def _manifest_path(self):
+        return self.cache_dir / "outputs.json"
+
+    def manifest(self):
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self._manifest_path().read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def save_manifest(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path().write_text(json.dumps(self.manifest(), indent=2, sort_keys=True), encoding="utf-8")
+
+    def code_version(self):
+        """Digest of the builder, the deck tooling it calls and the binary decoder."""
+        if self._code_version is None:
+            sources = [Path(__file__).read_bytes()]
+            sources += [Path(sys.modules[name].__file__).read_bytes() for name in DATA_BLOCK_MODULES]
+            self._code_version = _digest(deckformat.js_decoder(), *sources)
+        return self._code_version
+
+    def output_key(self, deck_bytes, variant=DEFAULT_VARIANT, embed="json", salt=""):
+        return _digest(self.shell(variant).digest, self.loader(embed), self.code_version(), embed, salt, deck_bytes)
+
+    def build_key(self, deck_bytes, variant=DEFAULT_VARIANT, embed="json", index=False, floor_packs=0, floor_seed=0):
+        """
+        output_key() for one build's options; every entry point keys its
+        pages through this, so a page is up to date whichever one built it.
+        The cleaner version is in it because build_decks.py cleans raw decks.
+        """
+        salt = f"cleaner-v{CLEANER_VERSION}"
+        if index:
+            salt += "+index"
+        if floor_packs:
+            salt += f"+floors{floor_packs}:{floor_seed}"
+        return self.output_key(deck_bytes, variant, embed, salt)
+
+    def is_up_to_date(self, output_path, key):
+        output_path = Path(output_path)
+        return output_path.exists() and self.manifest().get(str(output_path.resolve())) == key
+
+    def record(self, output_path, key, save=True):
+        self.manifest()[str(Path(output_path).resolve())] = key
+        if save:
+            self.save_manifest()
+
+    def write(self, html, output_path):
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            f.write(html)
+        return output_path.stat().st_size
+
+    def build(self, deck_path, output_path, variant=DEFAULT_VARIANT, embed="json", force=False, index=False,
+              floor_packs=0, floor_seed=0, profiler=None):
+        """
+        Build one page; returns a dict with `built` (False when the output
+        was already up to date), `cards` and `chapters` (None when skipped)
+        and `size`.  floor_packs layouts per chapter floor are baked in from
+        floor_seed.  The load, index, render and write stages are recorded
+        on profiler (profiling.py) if one is given.
+        """
+        profiler = profiler or Profiler()
+        with profiler.stage("load"):
+            deck_bytes = Path(deck_path).read_bytes()
+            key = self.build_key(deck_bytes, variant, embed, index, floor_packs, floor_seed)
+            fresh = not force and self.is_up_to_date(output_path, key)
+            flashcard_data = None if fresh else json.loads(deck_bytes.decode("utf-8-sig"))
+
+        if fresh:
+            return {"built": False, "cards": None, "chapters": None, "size": Path(output_path).stat().st_size}
+
+        with profiler.stage("index"):
+            deck_index = game_index(flashcard_data, choices=not self.shell(variant).lazy) if index else None
+            packs = None
+            if floor_packs and self.shell(variant).lazy:
+                packs = build_packs(len(group_by_chapter(flashcard_data)), floor_packs, floor_seed)
+        with profiler.stage("render"):
+            html = self.render(flashcard_data, variant, embed, deck_index, packs)
+        with profiler.stage("write"):
+            size = self.write(html, output_path)
+            self.record(output_path, key)
+        return {
+            "built": True,
+            "cards": len(flashcard_data),
+            "chapters": len(group_by_chapter(flashcard_data)),
+            "size": size,
+        }
+
+
+def variant_label(variant):
+    return Path(variant).stem.replace(" ", "_")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build deck x variant dungeon pages from templates.")
+    parser.add_argument("decks", nargs="+", help="deck JSON files")
+    parser.add_argument("--variant", action="append", dest="variants",
+                        help=f"template name or hand-made page (default: {DEFAULT_VARIANT}); repeatable")
+    parser.add_argument("--embed", choices=EMBED_MODES, default="json")
+    parser.add_argument("--index", action="store_true", help="inline precomputed deck indexes (DECK_INDEX)")
+    parser.add_argument("--floor-packs", type=int, default=0, metavar="N",
+                        help="bake N validated layouts per chapter floor into template pages")
+    parser.add_argument("--floor-seed", type=int, default=0)
+    parser.add_argument("--out-dir", default="build")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the output is up to date")
+    args = parser.parse_args()
+
+    builder = PageBuilder()
+    variants = args.variants or [DEFAULT_VARIANT]
+    built = skipped = 0
+
+    for deck in args.decks:
+        for variant in variants:
+            embed = args.embed if builder.shell(variant).lazy else "json"
+            output = Path(args.out_dir) / f"{Path(deck).stem}-{variant_label(variant)}.html"
+            result = builder.build(deck, output, variant, embed, force=args.force, index=args.index,
+                                   floor_packs=args.floor_packs, floor_seed=args.floor_seed)
+            status = "built  " if result["built"] else "skipped"
+            print(f"{status} {output} ({result['size'] / 1024:.1f} KB)")
+            built += result["built"]
+            skipped += not result["built"]
+
+    print(f"✅ {built} built, {skipped} up to date")
+
+
+if __name__ == "__main__":
+    main()
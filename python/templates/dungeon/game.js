@@ -0,0 +1,984 @@
+
+        // ============================================
+        // FLASHCARD DATA (Auto-injected by build script)
+        // ============================================
+        {{DATA_BLOCK}}
+        
+        // Chapters are turned into game cards on first use, so the sharded
+        // and binary builds only decode what the current floor needs.
+        const FLASHCARD_DATA = {};
+        const AVAILABLE_CHAPTERS = [...DECK_CHAPTERS].sort();
+        
+        function getChapterCards(chapter) {
+            if (!FLASHCARD_DATA[chapter]) {
+                const cards = loadChapterCards(chapter);
+                // A compressed chapter that has not streamed in yet is not cached
+                if (!cards.length) return cards;
+                const answers = ANSWER_KEYS[chapter] || [];
+                FLASHCARD_DATA[chapter] = cards.map((card, i) => ({
+                    id: card.id || `#${i}`,
+                    front: card.front,
+                    back: card.back,
+                    answers: answers[i] || null
+                }));
+            }
+            return FLASHCARD_DATA[chapter];
+        }
+        
+        function prefetchChapter(chapter) {
+            if (!chapter || FLASHCARD_DATA[chapter]) return;
+            const schedule = window.requestIdleCallback || (fn => setTimeout(fn, 200));
+            schedule(() => getChapterCards(chapter));
+        }
+        
+        // ============================================
+        // GAME STATE
+        // ============================================
+        // Balancing numbers come from dungeon_rules.py, shared with dungeon_sim.py
+        const RULES = {{RULES}};
+        
+        let gameState = {
+            player: { x: 1, y: 1, hp: RULES.player.hp, maxHp: RULES.player.hp, level: RULES.player.level, xp: 0, gold: 0 },
+            floor: 1,
+            currentChapter: AVAILABLE_CHAPTERS[0] || 'Chapter1',
+            dungeon: [],
+            monsters: [],
+            stairs: null,
+            revealed: new Uint32Array(0),
+            streak: 0,
+            messages: [],
+            inCombat: false,
+            currentMonster: null,
+            currentCard: null
+        };
+        
+        const GRID_SIZE = RULES.gridSize;
+        const VISION_RADIUS = RULES.visionRadius;
+        
+        const MONSTER_TYPES = RULES.monsterTypes;
+        
+        // ============================================
+        // DUNGEON GENERATION
+        // ============================================
+        function generateDungeon() {
+            // Initialize with walls
+            const dungeon = Array(GRID_SIZE).fill(null).map(() => 
+                Array(GRID_SIZE).fill('wall')
+            );
+            
+            // Generate rooms
+            const rooms = [];
+            const numRooms = RULES.rooms.min + Math.floor(Math.random() * RULES.rooms.extra);
+            
+            for (let i = 0; i < numRooms; i++) {
+                const roomWidth = RULES.rooms.size + Math.floor(Math.random() * RULES.rooms.sizeRange);
+                const roomHeight = RULES.rooms.size + Math.floor(Math.random() * RULES.rooms.sizeRange);
+                const roomX = 1 + Math.floor(Math.random() * (GRID_SIZE - roomWidth - 2));
+                const roomY = 1 + Math.floor(Math.random() * (GRID_SIZE - roomHeight - 2));
+                
+                // Check for overlap
+                let overlaps = false;
+                for (const room of rooms) {
+                    if (roomX < room.x + room.width + 1 && 
+                        roomX + roomWidth + 1 > room.x &&
+                        roomY < room.y + room.height + 1 && 
+                        roomY + roomHeight + 1 > room.y) {
+                        overlaps = true;
+                        break;
+                    }
+                }
+                
+                if (!overlaps) {
+                    rooms.push({ x: roomX, y: roomY, width: roomWidth, height: roomHeight });
+                    
+                    // Carve room
+                    for (let x = roomX; x < roomX + roomWidth; x++) {
+                        for (let y = roomY; y < roomY + roomHeight; y++) {
+                            dungeon[y][x] = 'floor';
+                        }
+                    }
+                }
+            }
+            
+            // Connect rooms with corridors
+            for (let i = 1; i < rooms.length; i++) {
+                const room1 = rooms[i - 1];
+                const room2 = rooms[i];
+                
+                const x1 = Math.floor(room1.x + room1.width / 2);
+                const y1 = Math.floor(room1.y + room1.height / 2);
+                const x2 = Math.floor(room2.x + room2.width / 2);
+                const y2 = Math.floor(room2.y + room2.height / 2);
+                
+                // Horizontal then vertical
+                let x = x1;
+                while (x !== x2) {
+                    dungeon[y1][x] = 'floor';
+                    x += x2 > x1 ? 1 : -1;
+                }
+                let y = y1;
+                while (y !== y2) {
+                    dungeon[y][x2] = 'floor';
+                    y += y2 > y1 ? 1 : -1;
+                }
+            }
+            
+            return { dungeon, rooms };
+        }
+        
+        function getFloorCells(dungeon) {
+            const cells = [];
+            for (let y = 0; y < GRID_SIZE; y++) {
+                for (let x = 0; x < GRID_SIZE; x++) {
+                    if (dungeon[y][x] === 'floor') {
+                        cells.push({ x, y });
+                    }
+                }
+            }
+            return cells;
+        }
+        
+        // Layouts baked in by `written_standalone.py --floor-packs N`
+        // (floorpack.py): a bit per cell, then start, stairs and monsters.
+        // Their ids ("floor.layout") go in the log so a floor can be rebuilt.
+        function unpackFloor(floor) {
+            if (typeof FLOOR_PACKS === 'undefined' || FLOOR_PACKS.gridSize !== GRID_SIZE) return null;
+            const layouts = FLOOR_PACKS.floors[floor];
+            if (!layouts || layouts.length === 0) return null;
+            
+            const variant = Math.floor(Math.random() * layouts.length);
+            const raw = atob(layouts[variant]);
+            const byte = i => raw.charCodeAt(i);
+            const u16 = i => byte(i) | (byte(i + 1) << 8);
+            const cellAt = cell => ({ x: cell % GRID_SIZE, y: Math.floor(cell / GRID_SIZE) });
+            
+            const dungeon = [];
+            for (let y = 0; y < GRID_SIZE; y++) {
+                const row = [];
+                for (let x = 0; x < GRID_SIZE; x++) {
+                    const i = y * GRID_SIZE + x;
+                    row.push((byte(i >> 3) >> (i & 7)) & 1 ? 'floor' : 'wall');
+                }
+                dungeon.push(row);
+            }
+            
+            let pos = (GRID_SIZE * GRID_SIZE + 7) >> 3;
+            const start = cellAt(u16(pos));
+            const stairs = cellAt(u16(pos + 2));
+            const monsters = [];
+            const count = byte(pos + 4);
+            pos += 5;
+            for (let i = 0; i < count; i++, pos += 3) {
+                monsters.push({ ...cellAt(u16(pos)), type: MONSTER_TYPES[byte(pos + 2)] });
+            }
+            return { id: `${floor}.${variant}`, dungeon, start, stairs, monsters };
+        }
+        
+        function generateFloor() {
+            const { dungeon, rooms } = generateDungeon();
+            const floorCells = getFloorCells(dungeon);
+            
+            // Place player in first room
+            const start = rooms.length > 0
+                ? { x: rooms[0].x + 1, y: rooms[0].y + 1 }
+                : { x: floorCells[0].x, y: floorCells[0].y };
+            
+            // Remove player position from available cells
+            const availableCells = floorCells.filter(c => 
+                !(c.x === start.x && c.y === start.y)
+            );
+            
+            // Place stairs in last room
+            let stairs;
+            if (rooms.length > 1) {
+                const lastRoom = rooms[rooms.length - 1];
+                stairs = { 
+                    x: lastRoom.x + Math.floor(lastRoom.width / 2), 
+                    y: lastRoom.y + Math.floor(lastRoom.height / 2) 
+                };
+            } else {
+                const stairCell = availableCells[availableCells.length - 1];
+                stairs = { x: stairCell.x, y: stairCell.y };
+            }
+            
+            // Place monsters
+            const numMonsters = RULES.monstersBase + gameState.floor;
+            const monsters = [];
+            
+            const monsterCells = availableCells.filter(c => 
+                !(c.x === stairs.x && c.y === stairs.y)
+            );
+            
+            // Higher floors get tougher monsters
+            const eligibleTypes = MONSTER_TYPES.filter(m => m.minFloor <= gameState.floor);
+            
+            for (let i = 0; i < Math.min(numMonsters, monsterCells.length); i++) {
+                const idx = Math.floor(Math.random() * monsterCells.length);
+                const cell = monsterCells.splice(idx, 1)[0];
+                const monsterType = eligibleTypes[Math.floor(Math.random() * eligibleTypes.length)];
+                monsters.push({ x: cell.x, y: cell.y, type: monsterType });
+            }
+            return { id: null, dungeon, start, stairs, monsters };
+        }
+        
+        function initFloor() {
+            const layout = unpackFloor(gameState.floor) || generateFloor();
+            gameState.dungeon = layout.dungeon;
+            gameState.revealed = newFog();
+            gameState.player.x = layout.start.x;
+            gameState.player.y = layout.start.y;
+            gameState.stairs = layout.stairs;
+            
+            // Scale monster stats with floor
+            const floorScale = 1 + (gameState.floor - 1) * RULES.floorScaleStep;
+            
+            gameState.monsters = layout.monsters.map(({ x, y, type }) => ({
+                ...type,
+                x,
+                y,
+                hp: Math.floor(type.hp * floorScale),
+                maxHp: Math.floor(type.hp * floorScale),
+                damage: Math.floor(type.damage * floorScale)
+            }));
+            resetGrid();
+            
+            // Update chapter based on floor
+            const chapterIdx = (gameState.floor - 1) % AVAILABLE_CHAPTERS.length;
+            gameState.currentChapter = AVAILABLE_CHAPTERS[chapterIdx];
+            
+            // Decode this floor's chapter now and the next floor's when idle
+            getChapterCards(gameState.currentChapter);
+            prefetchChapter(AVAILABLE_CHAPTERS[(chapterIdx + 1) % AVAILABLE_CHAPTERS.length]);
+            
+            updateVision();
+            render();
+            addMessage(`Entered Floor ${gameState.floor} - Chapter: ${gameState.currentChapter}`
+                + (layout.id ? ` (layout ${layout.id})` : ''), 'info');
+        }
+        
+        // Fog of war is a bitset: one 32-bit word per grid row, bit x set
+        // once column x has been seen (grids up to 32 wide).  The vision
+        // circle is precomputed as one row mask per vertical offset, and
+        // a reveal ORs those masks into the rows around the player.
+        const VISION_STENCIL = [];
+        for (let dy = -VISION_RADIUS; dy <= VISION_RADIUS; dy++) {
+            let mask = 0;
+            for (let dx = -VISION_RADIUS; dx <= VISION_RADIUS; dx++) {
+                if (dx * dx + dy * dy <= VISION_RADIUS * VISION_RADIUS) {
+                    mask |= 1 << (dx + VISION_RADIUS);
+                }
+            }
+            VISION_STENCIL.push(mask);
+        }
+        
+        function newFog() {
+            return new Uint32Array(GRID_SIZE);
+        }
+        
+        function isRevealed(x, y) {
+            return (gameState.revealed[y] >>> x) & 1;
+        }
+        
+        function updateVision() {
+            const { x: px, y: py } = gameState.player;
+            const rowMask = GRID_SIZE >= 32 ? 0xFFFFFFFF : (1 << GRID_SIZE) - 1;
+            const shift = px - VISION_RADIUS;
+        
+            VISION_STENCIL.forEach((mask, i) => {
+                const y = py - VISION_RADIUS + i;
+                if (y < 0 || y >= GRID_SIZE) return;
+        
+                const row = (shift >= 0 ? mask << shift : mask >>> -shift) & rowMask;
+                let added = row & ~gameState.revealed[y];
+                gameState.revealed[y] |= row;
+                while (added) {
+                    const x = 31 - Math.clz32(added);
+                    markDirty(x, y);
+                    added ^= 1 << x;
+                }
+            });
+        }
+        
+        // ============================================
+        // RENDERING
+        // ============================================
+        // Cell elements are created once and kept; each move only redraws
+        // the cells marked dirty (the player's old and new square, newly
+        // revealed fog, a defeated monster).  resetGrid() marks a new floor.
+        const view = {
+            cells: [],              // cell elements by index y * GRID_SIZE + x
+            monsterAt: new Map(),   // cell index -> monster
+            dirty: new Set()
+        };
+        
+        function cellIndex(x, y) {
+            return y * GRID_SIZE + x;
+        }
+        
+        function markDirty(x, y) {
+            view.dirty.add(cellIndex(x, y));
+        }
+        
+        function monsterAt(x, y) {
+            return view.monsterAt.get(cellIndex(x, y));
+        }
+        
+        function resetGrid() {
+            if (view.cells.length !== GRID_SIZE * GRID_SIZE) {
+                const grid = document.getElementById('dungeon-grid');
+                grid.style.gridTemplateColumns = `repeat(${GRID_SIZE}, 28px)`;
+                grid.innerHTML = '';
+                view.cells = [];
+                for (let i = 0; i < GRID_SIZE * GRID_SIZE; i++) {
+                    const cell = document.createElement('div');
+                    grid.appendChild(cell);
+                    view.cells.push(cell);
+                }
+            }
+            view.monsterAt = new Map(gameState.monsters.map(m => [cellIndex(m.x, m.y), m]));
+            view.dirty = new Set(view.cells.keys());
+        }
+        
+        function drawCell(i) {
+            const x = i % GRID_SIZE;
+            const y = Math.floor(i / GRID_SIZE);
+            let className = 'cell';
+            let text = '';
+            
+            if (!isRevealed(x, y)) {
+                className += ' cell-fog';
+            } else if (x === gameState.player.x && y === gameState.player.y) {
+                className += ' cell-player';
+                text = '🧙';
+            } else if (gameState.stairs && x === gameState.stairs.x && y === gameState.stairs.y) {
+                className += ' cell-stairs';
+                text = '🪜';
+            } else {
+                const monster = view.monsterAt.get(i);
+                if (monster) {
+                    className += ' cell-monster';
+                    text = monster.emoji;
+                } else if (gameState.dungeon[y][x] === 'wall') {
+                    className += ' cell-wall';
+                } else {
+                    className += ' cell-floor';
+                }
+            }
+            
+            const cell = view.cells[i];
+            if (cell.className !== className) cell.className = className;
+            if (cell.textContent !== text) cell.textContent = text;
+        }
+        
+        function render() {
+            view.dirty.forEach(drawCell);
+            view.dirty.clear();
+            
+            // Update stats
+            const hpPercent = (gameState.player.hp / gameState.player.maxHp) * 100;
+            document.getElementById('hp-bar').style.width = `${hpPercent}%`;
+            document.getElementById('hp-text').textContent = `${gameState.player.hp}/${gameState.player.maxHp}`;
+            document.getElementById('level').textContent = gameState.player.level;
+            document.getElementById('xp').textContent = gameState.player.xp;
+            document.getElementById('xp-needed').textContent = getXpForNextLevel();
+            document.getElementById('gold').textContent = gameState.player.gold;
+            document.getElementById('floor').textContent = gameState.floor;
+            document.getElementById('chapter').textContent = gameState.currentChapter.replace('Chapter', '');
+        }
+        
+        function getXpForNextLevel() {
+            return gameState.player.level * RULES.xpPerLevel;
+        }
+        
+        function addMessage(text, type = 'info') {
+            gameState.messages.unshift({ text, type });
+            if (gameState.messages.length > 20) gameState.messages.pop();
+            
+            const log = document.getElementById('message-log');
+            log.innerHTML = gameState.messages.map(m => 
+                `<div class="message message-${m.type}">${m.text}</div>`
+            ).join('');
+        }
+        
+        // ============================================
+        // MOVEMENT
+        // ============================================
+        function movePlayer(dx, dy) {
+            if (gameState.inCombat) return;
+            
+            const newX = gameState.player.x + dx;
+            const newY = gameState.player.y + dy;
+            
+            // Bounds check
+            if (newX < 0 || newX >= GRID_SIZE || newY < 0 || newY >= GRID_SIZE) return;
+            
+            // Wall check
+            if (gameState.dungeon[newY][newX] === 'wall') return;
+            
+            // Monster check
+            const monster = monsterAt(newX, newY);
+            if (monster) {
+                startCombat(monster);
+                return;
+            }
+            
+            // Move player
+            markDirty(gameState.player.x, gameState.player.y);
+            markDirty(newX, newY);
+            gameState.player.x = newX;
+            gameState.player.y = newY;
+            
+            // Stairs check
+            if (gameState.stairs && newX === gameState.stairs.x && newY === gameState.stairs.y) {
+                gameState.floor++;
+                addMessage(`Descending to Floor ${gameState.floor}...`, 'info');
+                initFloor();
+                return;
+            }
+            
+            updateVision();
+            render();
+        }
+        
+        // Keyboard controls
+        document.addEventListener('keydown', (e) => {
+            switch(e.key) {
+                case 'ArrowUp':
+                case 'w':
+                case 'W':
+                    movePlayer(0, -1);
+                    break;
+                case 'ArrowDown':
+                case 's':
+                case 'S':
+                    movePlayer(0, 1);
+                    break;
+                case 'ArrowLeft':
+                case 'a':
+                case 'A':
+                    movePlayer(-1, 0);
+                    break;
+                case 'ArrowRight':
+                case 'd':
+                case 'D':
+                    movePlayer(1, 0);
+                    break;
+            }
+        });
+        
+        // ============================================
+        // ANSWER LOG
+        // ============================================
+        // Every answer is appended to a log for offline analysis
+        // (python/data/analytics.py, regraded by answermatch.py).  An event is
+        //   [time (s), card, latency (ms), correct (0/1), floor, chapter, answer]
+        // with the card as its id, or "#position" in its chapter, and the
+        // answer as typed or the text of the chosen option.  Events
+        // go to IndexedDB in chunks of ANSWER_LOG_BATCH (one write per
+        // chunk); the tail is flushed when the page is hidden.  Without
+        // IndexedDB the log only lasts as long as the page.
+        const ANSWER_LOG_DB = 'dungeon-answers';
+        const ANSWER_LOG_STORE = 'chunks';
+        const ANSWER_LOG_BATCH = 32;
+        const answerLog = { pending: [], unsaved: [], db: null, shownAt: 0 };
+        
+        function openAnswerLog() {
+            if (!answerLog.db) {
+                answerLog.db = new Promise(resolve => {
+                    if (typeof indexedDB === 'undefined') return resolve(null);
+                    const request = indexedDB.open(ANSWER_LOG_DB, 1);
+                    request.onupgradeneeded = () =>
+                        request.result.createObjectStore(ANSWER_LOG_STORE, { autoIncrement: true });
+                    request.onsuccess = () => resolve(request.result);
+                    request.onerror = () => resolve(null);
+                });
+            }
+            return answerLog.db;
+        }
+        
+        function flushAnswerLog() {
+            if (!answerLog.pending.length) return Promise.resolve();
+            const chunk = answerLog.pending;
+            answerLog.pending = [];
+            return openAnswerLog().then(db => new Promise(resolve => {
+                if (!db) {
+                    answerLog.unsaved.push(chunk);
+                    return resolve();
+                }
+                const tx = db.transaction(ANSWER_LOG_STORE, 'readwrite');
+                tx.objectStore(ANSWER_LOG_STORE).add(chunk);
+                tx.oncomplete = resolve;
+                tx.onerror = () => {
+                    answerLog.unsaved.push(chunk);
+                    resolve();
+                };
+            }));
+        }
+        
+        function logAnswer(card, correct, answer) {
+            answerLog.pending.push([
+                Math.floor(Date.now() / 1000), card.id,
+                Math.round(performance.now() - answerLog.shownAt), correct ? 1 : 0,
+                gameState.floor, gameState.currentChapter, answer
+            ]);
+            if (answerLog.pending.length >= ANSWER_LOG_BATCH) flushAnswerLog();
+        }
+        
+        // All chunks, stored and not, oldest first
+        function readAnswerLog() {
+            return flushAnswerLog().then(openAnswerLog).then(db => new Promise(resolve => {
+                if (!db) return resolve(answerLog.unsaved);
+                const request = db.transaction(ANSWER_LOG_STORE).objectStore(ANSWER_LOG_STORE).getAll();
+                request.onsuccess = () => resolve([...request.result, ...answerLog.unsaved]);
+                request.onerror = () => resolve(answerLog.unsaved);
+            }));
+        }
+        
+        // Download the log as JSON lines, the input of analytics.py
+        function exportAnswerLog() {
+            return readAnswerLog().then(chunks => {
+                const lines = chunks.flat()
+                    .sort((a, b) => a[0] - b[0])
+                    .map(([t, id, latency, correct, floor, chapter, answer]) =>
+                        JSON.stringify({ t, id, latency, correct: !!correct, floor, chapter, answer }));
+                const url = URL.createObjectURL(new Blob(lines.map(line => line + '\n'), { type: 'application/x-ndjson' }));
+                const link = document.createElement('a');
+                link.href = url;
+                link.download = `dungeon-answers-${new Date().toISOString().slice(0, 10)}.jsonl`;
+                link.click();
+                setTimeout(() => URL.revokeObjectURL(url), 0);
+                addMessage(`📤 Exported ${lines.length} answers`, 'info');
+            });
+        }
+        
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') flushAnswerLog();
+        });
+        
+        // ============================================
+        // PERF OVERLAY
+        // ============================================
+        // Opt-in timings for lag reports: open the page with ?perf or press
+        // ` (backquote) to wrap the functions below in performance.mark/
+        // measure and show their rolling p50/p95, the DOM node count and the
+        // JS heap (Chrome only).  Nothing is wrapped until it is switched on,
+        // and 💾 downloads every sample as JSON.
+        const PERF_WINDOW = 120;          // calls per function in the rolling stats
+        const PERF_MAX_SAMPLES = 20000;   // kept for the download
+        const PERF_REFRESH_MS = 500;
+        const perf = { installed: false, visible: false, started: 0, refreshed: 0, pending: false,
+                       recent: {}, samples: [], snapshots: [] };
+        
+        function installPerf() {
+            perf.installed = true;
+            perf.started = performance.now();
+            initFloor = perfWrap('initFloor', initFloor);
+            render = perfWrap('render', render);
+            updateVision = perfWrap('updateVision', updateVision);
+            showCard = perfWrap('showCard', showCard);
+        }
+        
+        function perfWrap(name, fn) {
+            const mark = `perf-${name}`;
+            return function (...args) {
+                if (!perf.visible) return fn.apply(this, args);
+                performance.mark(mark);
+                try {
+                    return fn.apply(this, args);
+                } finally {
+                    performance.measure(mark, mark);
+                    const entries = performance.getEntriesByName(mark, 'measure');
+                    recordPerf(name, entries[entries.length - 1].duration);
+                    performance.clearMarks(mark);
+                    performance.clearMeasures(mark);
+                }
+            };
+        }
+        
+        function recordPerf(name, ms) {
+            const recent = perf.recent[name] = perf.recent[name] || [];
+            recent.push(ms);
+            if (recent.length > PERF_WINDOW) recent.shift();
+            if (perf.samples.length < PERF_MAX_SAMPLES) {
+                perf.samples.push([name, Math.round(performance.now() - perf.started), +ms.toFixed(3)]);
+            }
+            // Redrawn after the measured call returns, so it is not timed itself
+            if (!perf.pending && performance.now() - perf.refreshed > PERF_REFRESH_MS) {
+                perf.pending = true;
+                setTimeout(renderPerfOverlay, 0);
+            }
+        }
+        
+        function percentile(sorted, p) {
+            return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+        }
+        
+        function perfSummary() {
+            const summary = {};
+            Object.entries(perf.recent).forEach(([name, recent]) => {
+                const sorted = [...recent].sort((a, b) => a - b);
+                summary[name] = { calls: sorted.length, p50: percentile(sorted, 0.5), p95: percentile(sorted, 0.95) };
+            });
+            return summary;
+        }
+        
+        function perfOverlay() {
+            let overlay = document.getElementById('perf-overlay');
+            if (!overlay) {
+                overlay = document.createElement('div');
+                overlay.id = 'perf-overlay';
+                overlay.style.cssText = 'position:fixed;top:8px;right:8px;z-index:9999;padding:8px;' +
+                    'background:rgba(0,0,0,0.85);color:#7fff7f;font:12px monospace;border-radius:4px';
+                document.body.appendChild(overlay);
+            }
+            return overlay;
+        }
+        
+        function renderPerfOverlay() {
+            perf.pending = false;
+            if (!perf.visible) return;
+            perf.refreshed = performance.now();
+            const nodes = document.getElementsByTagName('*').length;
+            const heap = performance.memory ? performance.memory.usedJSHeapSize : null;
+            if (perf.snapshots.length < PERF_MAX_SAMPLES) {
+                perf.snapshots.push([Math.round(perf.refreshed - perf.started), nodes, heap]);
+            }
+            const rows = Object.entries(perfSummary()).map(([name, s]) =>
+                `<tr><td>${name}</td><td>${s.calls}</td><td>${s.p50.toFixed(2)}</td><td>${s.p95.toFixed(2)}</td></tr>`
+            ).join('');
+            perfOverlay().innerHTML =
+                `<table><tr><th>ms</th><th>n</th><th>p50</th><th>p95</th></tr>${rows}</table>` +
+                `<div>DOM nodes ${nodes}${heap === null ? '' : ` · heap ${(heap / 1048576).toFixed(1)} MB`}</div>` +
+                `<button onclick="downloadPerfSamples()">💾 Samples</button>`;
+        }
+        
+        function togglePerf() {
+            if (!perf.installed) installPerf();
+            perf.visible = !perf.visible;
+            perfOverlay().style.display = perf.visible ? 'block' : 'none';
+            renderPerfOverlay();
+        }
+        
+        // Samples are [function, ms since start, duration ms], snapshots
+        // [ms since start, DOM nodes, JS heap bytes or null]
+        function downloadPerfSamples() {
+            const data = {
+                userAgent: typeof navigator === 'undefined' ? '' : navigator.userAgent,
+                date: new Date().toISOString(),
+                window: PERF_WINDOW,
+                summary: perfSummary(),
+                samples: perf.samples,
+                snapshots: perf.snapshots
+            };
+            const url = URL.createObjectURL(new Blob([JSON.stringify(data)], { type: 'application/json' }));
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = `dungeon-perf-${data.date.slice(0, 19).replace(/:/g, '')}.json`;
+            link.click();
+            setTimeout(() => URL.revokeObjectURL(url), 0);
+        }
+        
+        document.addEventListener('keydown', (e) => {
+            if (e.key === '`' && !(e.target && e.target.tagName === 'INPUT')) togglePerf();
+        });
+        if (new URLSearchParams(location.search).has('perf')) togglePerf();
+        
+        // ============================================
+        // ANSWER MATCHING
+        // ============================================
+        // The rules of python/data/answermatch.py: keep ARTICLES, MAX_EDITS
+        // and normalizeAnswer in sync.  A card's accepted keys (the answer,
+        // its "," and "/" alternatives outside (...), each also without its
+        // (...) part and a leading article, normalized) are worked out once
+        // per card, or come inlined as DECK_INDEX.answers from --index builds.
+        const ANSWER_KEYS = (typeof DECK_INDEX !== 'undefined' && DECK_INDEX.answers) || {};
+        const ARTICLES = new Set(['a', 'an', 'the', 'to', 'en', 'ett', 'att']);
+        const MAX_EDITS = [[8, 2], [5, 1], [0, 0]]; // [shortest key length, edits allowed]
+        
+        // Lower case, diacritics folded (å -> a, é -> e), no punctuation
+        function normalizeAnswer(str) {
+            return str.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '')
+                .replace(/[.,!?;:'"()\[\]{}]/g, '')
+                .split(/\s+/).filter(Boolean).join(' ');
+        }
+        
+        function stripArticle(key) {
+            const space = key.indexOf(' ');
+            return space > 0 && ARTICLES.has(key.slice(0, space)) ? key.slice(space + 1) : key;
+        }
+        
+        function answerKeys(back) {
+            const keys = [];
+            [back, ...back.split(/[,\/](?![^(]*\))/)].forEach(text => {
+                [text, text.replace(/\([^)]*\)/g, '')].forEach(variant => {
+                    const key = normalizeAnswer(variant);
+                    [key, stripArticle(key)].forEach(k => {
+                        if (k && !keys.includes(k)) keys.push(k);
+                    });
+                });
+            });
+            return keys;
+        }
+        
+        function maxEdits(key) {
+            return MAX_EDITS.find(([length]) => key.length >= length)[1];
+        }
+        
+        // At most `limit` edits apart (insert, delete, substitute, swap two
+        // neighbours)?  Gives up as soon as a whole row is over the limit.
+        function withinEdits(a, b, limit) {
+            if (Math.abs(a.length - b.length) > limit) return false;
+            if (limit === 0) return a === b;
+            let before = null;
+            let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+            for (let i = 1; i <= a.length; i++) {
+                const current = [i];
+                let best = i;
+                for (let j = 1; j <= b.length; j++) {
+                    let cost = Math.min(previous[j] + 1, current[j - 1] + 1,
+                        previous[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1));
+                    if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                        cost = Math.min(cost, before[j - 2] + 1);
+                    }
+                    current.push(cost);
+                    best = Math.min(best, cost);
+                }
+                if (best > limit) return false;
+                before = previous;
+                previous = current;
+            }
+            return previous[b.length] <= limit;
+        }
+        
+        // 'exact', 'fuzzy' (a typo away from a key) or null; known holds
+        // the deck's keys, and typing one of them is another word, not a typo
+        function matchAnswer(answer, keys, fuzzy = true, known = null) {
+            const typed = normalizeAnswer(answer);
+            if (!typed) return null;
+            const candidates = [typed, stripArticle(typed)];
+            if (candidates.some(c => keys.includes(c))) return 'exact';
+            if (known && candidates.some(c => known.has(c))) return null;
+            if (fuzzy && keys.some(key => candidates.some(c => withinEdits(c, key, maxEdits(key))))) return 'fuzzy';
+            return null;
+        }
+        
+        function cardAnswerKeys(card) {
+            if (!card.answers) card.answers = answerKeys(card.back);
+            return card.answers;
+        }
+        
+        // Keys of every chapter loaded so far (the whole deck with --index)
+        let knownAnswers = { chapters: -1, keys: new Set() };
+        function knownAnswerKeys() {
+            const chapters = Object.keys(FLASHCARD_DATA);
+            if (chapters.length !== knownAnswers.chapters) {
+                const keys = new Set(Object.values(ANSWER_KEYS).flat(2));
+                chapters.forEach(chapter => FLASHCARD_DATA[chapter].forEach(card => {
+                    cardAnswerKeys(card).forEach(key => keys.add(key));
+                }));
+                knownAnswers = { chapters: chapters.length, keys };
+            }
+            return knownAnswers.keys;
+        }
+        
+        // ============================================
+        // COMBAT
+        // ============================================
+        function showCard(card) {
+            gameState.currentCard = card;
+            document.getElementById('flashcard-word').textContent = card.front;
+            answerLog.shownAt = performance.now();
+        }
+        
+        function getRandomCard() {
+            let cards = getChapterCards(gameState.currentChapter);
+            if (cards.length === 0) cards = getChapterCards(AVAILABLE_CHAPTERS[0]);
+            if (cards.length === 0) return { front: 'hej', back: 'hello' };
+            return cards[Math.floor(Math.random() * cards.length)];
+        }
+        
+        function startCombat(monster) {
+            gameState.inCombat = true;
+            gameState.currentMonster = monster;
+            
+            document.getElementById('monster-name').textContent = `${monster.emoji} ${monster.name}`;
+            document.getElementById('monster-hp').textContent = monster.hp;
+            document.getElementById('monster-max-hp').textContent = monster.maxHp;
+            showCard(getRandomCard());
+            document.getElementById('answer-input').value = '';
+            document.getElementById('combat-result').classList.add('modal-hidden');
+            
+            updateStreakDisplay();
+            
+            document.getElementById('combat-modal').classList.remove('modal-hidden');
+            document.getElementById('answer-input').focus();
+        }
+        
+        function updateStreakDisplay() {
+            const display = document.getElementById('streak-display');
+            if (gameState.streak > 0) {
+                display.innerHTML = `<span class="streak-fire">🔥 Streak: ${gameState.streak} (x${1 + gameState.streak * RULES.streakBonus} damage)</span>`;
+            } else {
+                display.innerHTML = '';
+            }
+        }
+        
+        function submitAnswer() {
+            const input = document.getElementById('answer-input');
+            const userAnswer = input.value;
+            const grade = matchAnswer(userAnswer, cardAnswerKeys(gameState.currentCard), true, knownAnswerKeys());
+            const correct = grade !== null;
+            logAnswer(gameState.currentCard, correct, userAnswer);
+            
+            const resultDiv = document.getElementById('combat-result');
+            resultDiv.classList.remove('modal-hidden', 'result-correct', 'result-incorrect');
+            
+            if (correct) {
+                gameState.streak++;
+                const damageMultiplier = 1 + gameState.streak * RULES.streakBonus;
+                const baseDamage = RULES.baseDamage + gameState.player.level * RULES.damagePerLevel;
+                const damage = Math.floor(baseDamage * damageMultiplier);
+                
+                gameState.currentMonster.hp -= damage;
+                
+                resultDiv.classList.add('result-correct');
+                resultDiv.textContent = grade === 'fuzzy'
+                    ? `✅ Close enough ("${gameState.currentCard.back}")! Dealt ${damage} damage!`
+                    : `✅ Correct! Dealt ${damage} damage!`;
+                
+                document.getElementById('monster-hp').textContent = Math.max(0, gameState.currentMonster.hp);
+                
+                if (gameState.currentMonster.hp <= 0) {
+                    // Monster defeated
+                    setTimeout(() => defeatMonster(), 1000);
+                } else {
+                    // Continue combat with new card
+                    setTimeout(() => {
+                        showCard(getRandomCard());
+                        input.value = '';
+                        resultDiv.classList.add('modal-hidden');
+                        updateStreakDisplay();
+                        input.focus();
+                    }, 1000);
+                }
+            } else {
+                gameState.streak = 0;
+                const damage = gameState.currentMonster.damage;
+                gameState.player.hp -= damage;
+                
+                resultDiv.classList.add('result-incorrect');
+                resultDiv.textContent = `❌ Wrong! The answer was "${gameState.currentCard.back}". You took ${damage} damage!`;
+                
+                if (gameState.player.hp <= 0) {
+                    setTimeout(() => gameOver(), 1000);
+                } else {
+                    setTimeout(() => {
+                        showCard(getRandomCard());
+                        input.value = '';
+                        resultDiv.classList.add('modal-hidden');
+                        updateStreakDisplay();
+                        render();
+                        input.focus();
+                    }, 1500);
+                }
+            }
+        }
+        
+        function defeatMonster() {
+            const monster = gameState.currentMonster;
+            
+            // Award XP and gold
+            gameState.player.xp += monster.xp;
+            gameState.player.gold += monster.gold;
+            
+            addMessage(`Defeated ${monster.name}! +${monster.xp} XP, +${monster.gold} gold`, 'reward');
+            
+            // Remove monster
+            gameState.monsters = gameState.monsters.filter(m => m !== monster);
+            view.monsterAt.delete(cellIndex(monster.x, monster.y));
+            markDirty(monster.x, monster.y);
+            
+            // Check level up
+            while (gameState.player.xp >= getXpForNextLevel()) {
+                gameState.player.xp -= getXpForNextLevel();
+                gameState.player.level++;
+                gameState.player.maxHp += RULES.hpPerLevel;
+                gameState.player.hp = gameState.player.maxHp;
+                addMessage(`🎉 Level Up! Now level ${gameState.player.level}!`, 'reward');
+            }
+            
+            endCombat();
+        }
+        
+        function fleeCombat() {
+            gameState.streak = 0;
+            const damage = Math.floor(gameState.currentMonster.damage / 2);
+            gameState.player.hp -= damage;
+            
+            addMessage(`Fled from ${gameState.currentMonster.name}! Took ${damage} damage.`, 'combat');
+            
+            if (gameState.player.hp <= 0) {
+                gameOver();
+            } else {
+                endCombat();
+            }
+        }
+        
+        function endCombat() {
+            gameState.inCombat = false;
+            gameState.currentMonster = null;
+            gameState.currentCard = null;
+            
+            document.getElementById('combat-modal').classList.add('modal-hidden');
+            render();
+        }
+        
+        function gameOver() {
+            document.getElementById('combat-modal').classList.add('modal-hidden');
+            document.getElementById('final-floor').textContent = gameState.floor;
+            document.getElementById('gameover-modal').classList.remove('modal-hidden');
+        }
+        
+        function restartGame() {
+            gameState = {
+                player: { x: 1, y: 1, hp: RULES.player.hp, maxHp: RULES.player.hp, level: RULES.player.level, xp: 0, gold: 0 },
+                floor: 1,
+                currentChapter: AVAILABLE_CHAPTERS[0] || 'Chapter1',
+                dungeon: [],
+                monsters: [],
+                stairs: null,
+                revealed: new Uint32Array(0),
+                streak: 0,
+                messages: [],
+                inCombat: false,
+                currentMonster: null,
+                currentCard: null
+            };
+            
+            document.getElementById('gameover-modal').classList.add('modal-hidden');
+            initFloor();
+        }
+        
+        // Handle Enter key in combat
+        document.getElementById('answer-input').addEventListener('keydown', (e) => {
+            if (e.key === 'Enter') {
+                submitAnswer();
+            }
+        });
+        
+        // ============================================
+        // START GAME
+        // ============================================
+        function startGame() {
+            initFloor();
+            addMessage('Welcome to the dungeon! Find the stairs to descend.', 'info');
+        }
+        
+        // Compressed builds start once the first chapter has been inflated
+        if (typeof chapterReady === 'function') {
+            chapterReady(AVAILABLE_CHAPTERS[0]).then(startGame,
+                error => addMessage(`Could not unpack the flashcards: ${error.message}`, 'combat'));
+        } else {
+            startGame();
+        }
+    
\ No newline at end of file
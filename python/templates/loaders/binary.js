@@ -0,0 +1,5 @@
+// Chapters of the embedded .deck blob are decoded on demand
+const DECK_CHAPTERS = DECK.chapters;
+function loadChapterCards(chapter) {
+    return DECK.cards(chapter);
+}
@@ -0,0 +1,39 @@
+// Gzip-compressed JSON lines, one chapter per line (data/compact.py),
+// inflated with DecompressionStream; each chapter is parsed as soon as
+// its line has streamed in
+const RAW_CHAPTERS = {};
+const chapterWaiters = {};
+function loadChapterCards(chapter) {
+    return RAW_CHAPTERS[chapter] || [];
+}
+function chapterReady(chapter) {
+    if (RAW_CHAPTERS[chapter] || !DECK_CHAPTERS.includes(chapter)) return Promise.resolve();
+    // Settles early if inflating fails, so callers see the error
+    const arrived = new Promise(resolve => (chapterWaiters[chapter] = chapterWaiters[chapter] || []).push(resolve));
+    return Promise.race([arrived, DECK_READY]);
+}
+function addChapter(line) {
+    if (!line) return;
+    const cards = JSON.parse(line);
+    const chapter = DECK_CHAPTERS[Object.keys(RAW_CHAPTERS).length];
+    RAW_CHAPTERS[chapter] = cards;
+    (chapterWaiters[chapter] || []).forEach(resolve => resolve());
+    delete chapterWaiters[chapter];
+}
+async function inflateDeck() {
+    const bytes = Uint8Array.from(atob(DECK_GZIP), c => c.charCodeAt(0));
+    const reader = new Blob([bytes]).stream()
+        .pipeThrough(new DecompressionStream('gzip'))
+        .pipeThrough(new TextDecoderStream())
+        .getReader();
+    let pending = '';
+    for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        const lines = (pending + value).split('\n');
+        pending = lines.pop();
+        lines.forEach(addChapter);
+    }
+    addChapter(pending);
+}
+const DECK_READY = inflateDeck();
@@ -0,0 +1,10 @@
+// Group the inlined deck by chapter once
+const RAW_CHAPTERS = {};
+RAW_FLASHCARD_DATA.forEach(card => {
+    const chapter = card.chapter || 'Chapter1';
+    (RAW_CHAPTERS[chapter] = RAW_CHAPTERS[chapter] || []).push(card);
+});
+const DECK_CHAPTERS = Object.keys(RAW_CHAPTERS);
+function loadChapterCards(chapter) {
+    return RAW_CHAPTERS[chapter] || [];
+}
@@ -0,0 +1,5 @@
+// One <script type="application/json"> block per chapter, parsed on demand
+function loadChapterCards(chapter) {
+    const shard = document.getElementById(`deck-${chapter}`);
+    return shard ? JSON.parse(shard.textContent) : [];
+}
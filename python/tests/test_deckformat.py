@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "data"))
+
+from deckformat import Deck, encode_deck, write_deck  # noqa: E402
+from stats import deck_stats  # noqa: E402
+
+# Raw cards: no id, type, partOfSpeech, forms or tags, so the file leaves those columns out
+RAW_CARDS = [
+    {"front": "sten (-en, -ar, -arna)", "back": "stone", "chapter": "Chapter1"},
+    {"front": "ringa (-er, -de, -t)", "back": "call", "chapter": "Chapter1"},
+    {"front": "hej", "back": "hello", "chapter": "Chapter2"},
+]
+
+
+def test_missing_columns_have_the_deck_length():
+    deck = Deck(encode_deck(RAW_CARDS))
+    assert not deck.has_column("type")
+    assert deck.has_column("front")
+    assert list(deck.column("type")) == [None, None, None]
+    assert len(deck.column("id", "Chapter1")) == 2
+    assert list(deck.column("id", "Chapter2")) == [None]
+    assert deck.to_list() == RAW_CARDS
+
+
+def test_stats_of_a_deck_with_a_column_mask(tmp_path):
+    path = tmp_path / "raw.deck"
+    write_deck(RAW_CARDS, path)
+    stats = deck_stats(str(path))
+    assert stats["total"]["cards"] == 3
+    assert stats["total"]["words"] == 0
+    assert stats["chapters"]["Chapter2"]["avg_back"] == 5.0
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "data"))
+
+from inflection import build_form, expand_forms, parse_front  # noqa: E402
+
+
+def forms_of(front):
+    parsed = parse_front(front)
+    return expand_forms(parsed.base, parsed.forms)
+
+
+def test_suffixes_are_appended():
+    assert forms_of("elev (-en, -er, -erna)") == {"form1": "eleven", "form2": "elever", "form3": "eleverna"}
+    assert forms_of("lärare (-n, –, -lärarna)") == {"form1": "läraren", "form2": None, "form3": "lärarna"}
+
+
+def test_suffix_merges_with_the_final_vowel():
+    assert forms_of("kaffe (-et)") == {"form1": "kaffet"}
+    assert forms_of("timme (-en, -ar, -arna)") == {"form1": "timmen", "form2": "timmar", "form3": "timmarna"}
+    assert forms_of("uttala (-ar, -ade, -at)") == {"form1": "uttalar", "form2": "uttalade", "form3": "uttalat"}
+    # A one-syllable headword keeps its vowel
+    assert forms_of("te (-et, -er, -erna)") == {"form1": "teet", "form2": "teer", "form3": "teerna"}
+
+
+def test_doubled_consonant_replaces_the_headwords():
+    assert forms_of("född (-tt, -dda)") == {"form1": "fött", "form2": "födda"}
+    assert build_form("blå", "-tt") == "blått"
+
+
+def test_ambiguous_expansion_is_kept_raw():
+    assert build_form("röd", "-tt") == "-tt"
+    assert forms_of("ge bort (-r, gav, -tt)") == {"raw": ["-r", "gav", "-tt"]}
+    assert forms_of("läsa (-er, -te, -t)") == {"raw": ["-er", "-te", "-t"]}